@@ -0,0 +1,126 @@
+# adaptativo.py - Modo adaptativo basado en la dificultad estimada de cada pregunta
+
+import bisect
+import json
+import math
+import os
+import random
+from typing import List, Dict, Tuple
+
+# Límites de la escala de dificultad/habilidad (modelo de Rasch, en logits)
+LIMITE_LOGIT = 4.0
+# Mínimo de respuestas registradas para confiar en la dificultad empírica de una pregunta
+MIN_RESPUESTAS_DIFICULTAD = 20
+# Cantidad de preguntas cercanas entre las que se sortea para no repetir siempre las mismas
+CANDIDATOS_CERCANOS = 3
+# Sorteos dentro de un bloque de dificultades iguales antes de recorrerlo entero
+SORTEOS_EMPATE = 8
+
+def probabilidad_acierto(habilidad: float, dificultad: float) -> float:
+    """Probabilidad de responder bien según el modelo de Rasch"""
+    return 1.0 / (1.0 + math.exp(dificultad - habilidad))
+
+def estimar_dificultades(preguntas: List[Dict], archivo_analisis: str = "analisis_items.json") -> Dict[int, float]:
+    """
+    Convierte la proporción de aciertos (p) del análisis de ítems en una dificultad en logits.
+    Las preguntas sin suficientes respuestas quedan con dificultad media (0).
+    """
+    dificultades = {p['id']: 0.0 for p in preguntas}
+    if not os.path.exists(archivo_analisis):
+        return dificultades
+
+    with open(archivo_analisis, 'r', encoding='utf-8') as f:
+        metricas = json.load(f)
+
+    for m in metricas:
+        if m['id'] in dificultades and m['n'] >= MIN_RESPUESTAS_DIFICULTAD:
+            p = min(max(m['p'], 0.02), 0.98)
+            dificultades[m['id']] = max(-LIMITE_LOGIT, min(LIMITE_LOGIT, math.log((1 - p) / p)))
+    return dificultades
+
+class IndiceDificultad:
+    """
+    Preguntas ordenadas por dificultad. Buscar la más adecuada para una habilidad
+    es una búsqueda binaria; cada pregunta se entrega una sola vez. El orden se
+    comparte entre sesiones (ver ordenar): cada índice solo guarda las que ya entregó.
+    """
+
+    def __init__(self, orden: Tuple[List[float], List[int]], entregadas=()):
+        self.dificultades, self.ids = orden
+        self.entregadas = set(entregadas)
+
+    @staticmethod
+    def ordenar(preguntas: List[Dict], dificultades: Dict[int, float]) -> Tuple[List[float], List[int]]:
+        """Dificultades e ids ordenados por dificultad, para construir índices"""
+        pares = sorted((dificultades.get(p['id'], 0.0), p['id']) for p in preguntas)
+        return [d for d, _ in pares], [i for _, i in pares]
+
+    def __len__(self):
+        return len(self.ids) - len(self.entregadas)
+
+    def extraer_cercana(self, habilidad: float) -> Tuple[int, float]:
+        """Saca del índice una pregunta de dificultad cercana a la habilidad y devuelve (id, dificultad)"""
+        pos = bisect.bisect_left(self.dificultades, habilidad)
+
+        # Se recorre hacia ambos lados desde la posición de inserción, de la más cercana a la más
+        # lejana, salteando las ya entregadas
+        izquierda, derecha = pos - 1, pos
+        candidatas = []
+        while len(candidatas) < CANDIDATOS_CERCANOS and (izquierda >= 0 or derecha < len(self.ids)):
+            if derecha >= len(self.ids) or (
+                izquierda >= 0 and habilidad - self.dificultades[izquierda] <= self.dificultades[derecha] - habilidad
+            ):
+                i, izquierda = izquierda, izquierda - 1
+            else:
+                i, derecha = derecha, derecha + 1
+            if self.ids[i] not in self.entregadas:
+                candidatas.append(i)
+        elegida = self._entre_iguales(random.choice(candidatas))
+
+        self.entregadas.add(self.ids[elegida])
+        return self.ids[elegida], self.dificultades[elegida]
+
+    def _entre_iguales(self, posicion: int) -> int:
+        """
+        Posición al azar, no entregada, entre las de igual dificultad que la dada. El recorrido
+        siempre llega a un bloque de empatadas por su borde (el orden dentro del bloque es por
+        id), y sin datos todas las preguntas valen 0: sin esto saldrían siempre las mismas.
+        """
+        dificultad = self.dificultades[posicion]
+        desde = bisect.bisect_left(self.dificultades, dificultad)
+        hasta = bisect.bisect_right(self.dificultades, dificultad)
+        if hasta - desde <= 1:
+            return posicion
+        for _ in range(SORTEOS_EMPATE):
+            i = random.randrange(desde, hasta)
+            if self.ids[i] not in self.entregadas:
+                return i
+        # Bloque casi agotado: se elige entre las que quedan
+        return random.choice([i for i in range(desde, hasta) if self.ids[i] not in self.entregadas])
+
+def estimar_habilidad(respuestas: List[Tuple[float, bool]]) -> Tuple[float, float]:
+    """
+    Estima la habilidad (máximo a posteriori con prior normal estándar) a partir de
+    pares (dificultad, correcta). Devuelve (habilidad, error estándar).
+    """
+    habilidad = 0.0
+    informacion = 1.0
+    for _ in range(20):
+        gradiente = -habilidad
+        informacion = 1.0
+        for dificultad, correcta in respuestas:
+            p = probabilidad_acierto(habilidad, dificultad)
+            gradiente += (1.0 if correcta else 0.0) - p
+            informacion += p * (1 - p)
+        paso = gradiente / informacion
+        habilidad = max(-LIMITE_LOGIT, min(LIMITE_LOGIT, habilidad + paso))
+        if abs(paso) < 1e-4:
+            break
+    return habilidad, 1.0 / math.sqrt(informacion)
+
+def porcentaje_esperado(habilidad: float, dificultades: Dict[int, float]) -> float:
+    """Porcentaje de aciertos esperado en un examen completo sobre todo el banco"""
+    if not dificultades:
+        return 0.0
+    total = sum(probabilidad_acierto(habilidad, d) for d in dificultades.values())
+    return total / len(dificultades) * 100
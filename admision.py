@@ -0,0 +1,137 @@
+# admision.py - Control de admisión de simulacros y liberación de datos de sesiones inactivas
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict
+
+from config import MAX_INICIOS_CONCURRENTES, ESPERA_MAXIMA_INICIO_SEGUNDOS, SESION_INACTIVA_MINUTOS
+
+# Esperas recientes que se usan para las métricas
+ESPERAS_REGISTRADAS = 500
+# Cada cuánto, como máximo, se buscan sesiones inactivas
+INTERVALO_LIMPIEZA_SEGUNDOS = 60
+
+class TurnoVencido(Exception):
+    """El pedido esperó en la cola más que el máximo permitido"""
+
+class ControlAdmision:
+    """
+    Limita cuántos simulacros se preparan a la vez. Los pedidos que exceden el límite
+    esperan en una cola por orden de llegada.
+    """
+
+    def __init__(self, max_concurrentes: int, espera_maxima: float):
+        self.max_concurrentes = max_concurrentes
+        self.espera_maxima = espera_maxima
+        self._condicion = threading.Condition()
+        self._en_curso = 0
+        self._siguiente_numero = 0
+        self._atendiendo = 0  # Número del primero de la cola
+        self._vencidos = set()
+        self._esperas = deque(maxlen=ESPERAS_REGISTRADAS)
+        self.max_en_cola = 0
+        self.admitidos = 0
+        self.rechazados = 0
+
+    @property
+    def en_cola(self) -> int:
+        return self._siguiente_numero - self._atendiendo - len(self._vencidos)
+
+    def _avanzar_cola(self):
+        while self._atendiendo in self._vencidos:
+            self._vencidos.discard(self._atendiendo)
+            self._atendiendo += 1
+
+    @contextmanager
+    def turno(self):
+        """Espera turno (o lanza TurnoVencido) y lo libera al salir del bloque"""
+        inicio = time.monotonic()
+        with self._condicion:
+            numero = self._siguiente_numero
+            self._siguiente_numero += 1
+            while numero != self._atendiendo or self._en_curso >= self.max_concurrentes:
+                # Solo cuenta como cola si alguien tiene que esperar
+                self.max_en_cola = max(self.max_en_cola, self.en_cola)
+                restante = self.espera_maxima - (time.monotonic() - inicio)
+                if restante <= 0:
+                    self._vencidos.add(numero)
+                    self._avanzar_cola()
+                    self.rechazados += 1
+                    self._condicion.notify_all()
+                    raise TurnoVencido()
+                self._condicion.wait(restante)
+            self._atendiendo += 1
+            self._avanzar_cola()
+            self._en_curso += 1
+            self.admitidos += 1
+            self._esperas.append(time.monotonic() - inicio)
+            # El siguiente de la cola puede entrar si todavía queda lugar
+            self._condicion.notify_all()
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._en_curso -= 1
+                self._condicion.notify_all()
+
+    def metricas(self) -> Dict:
+        with self._condicion:
+            esperas = sorted(self._esperas)
+            en_cola = self.en_cola
+            en_curso = self._en_curso
+        return {
+            'en_cola': en_cola,
+            'en_curso': en_curso,
+            'max_en_cola': self.max_en_cola,
+            'admitidos': self.admitidos,
+            'rechazados': self.rechazados,
+            'espera_media': sum(esperas) / len(esperas) if esperas else 0.0,
+            'espera_p95': esperas[int(0.95 * (len(esperas) - 1))] if esperas else 0.0,
+            'espera_max': esperas[-1] if esperas else 0.0
+        }
+
+class RegistroSesiones:
+    """
+    Datos pesados de cada sesión (p. ej. el precargador con sus figuras), fuera de
+    session_state para poder liberarlos cuando la sesión queda inactiva. Si la sesión
+    vuelve, se recrean al usarlos.
+    """
+
+    def __init__(self, inactividad: float):
+        self.inactividad = inactividad
+        self._sesiones = {}
+        self._lock = threading.Lock()
+        self._ultima_limpieza = time.monotonic()
+        self.liberadas = 0
+
+    def datos(self, sesion_id: str) -> Dict:
+        """Datos pesados de la sesión; marca la sesión como activa"""
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._sesiones.get(sesion_id)
+            if entrada is None:
+                entrada = self._sesiones[sesion_id] = [ahora, {}]
+            entrada[0] = ahora
+            limpiar = ahora - self._ultima_limpieza >= INTERVALO_LIMPIEZA_SEGUNDOS
+        if limpiar:
+            self.expirar()
+        return entrada[1]
+
+    def expirar(self) -> int:
+        """Libera los datos de las sesiones sin actividad reciente y devuelve cuántas eran"""
+        ahora = time.monotonic()
+        with self._lock:
+            self._ultima_limpieza = ahora
+            vencidas = [sid for sid, (acceso, _) in self._sesiones.items() if ahora - acceso > self.inactividad]
+            for sid in vencidas:
+                del self._sesiones[sid]
+            self.liberadas += len(vencidas)
+        return len(vencidas)
+
+    def __len__(self):
+        return len(self._sesiones)
+
+admision = ControlAdmision(MAX_INICIOS_CONCURRENTES, ESPERA_MAXIMA_INICIO_SEGUNDOS)
+sesiones = RegistroSesiones(SESION_INACTIVA_MINUTOS * 60)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Análisis de ítems del banco de preguntas
+Calcula dificultad (p), discriminación (punto-biserial) y tasa de elección de cada
+opción a partir del registro de intentos, y marca las preguntas sospechosas
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+from bancos import BANCOS, obtener_banco, banco_de_entorno
+
+# Umbrales para marcar preguntas a revisar
+MIN_RESPUESTAS = 20
+P_MUY_FACIL = 0.95
+P_MUY_DIFICIL = 0.25
+MIN_DISCRIMINACION = 0.0
+
+CAMPOS = ['n', 'suma_x', 'suma_r', 'suma_r2', 'suma_xr']
+
+def _huella_claves(preguntas):
+    """Huella de las claves del banco: si cambia una 'correcta', los acumulados se recalculan"""
+    datos = json.dumps([[p['id'], p['correcta'], len(p['opciones'])] for p in preguntas])
+    return hashlib.sha256(datos.encode('utf-8')).hexdigest()
+
+def _estado_vacio(n_preguntas, n_opciones, huella):
+    estado = {campo: np.zeros(n_preguntas) for campo in CAMPOS}
+    estado['elecciones'] = np.zeros((n_preguntas, n_opciones), dtype=np.int64)
+    estado['offset'] = 0
+    estado['huella'] = huella
+    return estado
+
+def cargar_estado(archivo_estado, n_preguntas, n_opciones, huella):
+    """Carga los acumulados guardados o crea unos vacíos si no sirven para el banco actual"""
+    if os.path.exists(archivo_estado):
+        with np.load(archivo_estado) as datos:
+            if str(datos['huella']) == huella and datos['elecciones'].shape == (n_preguntas, n_opciones):
+                estado = {campo: datos[campo] for campo in CAMPOS + ['elecciones']}
+                estado['offset'] = int(datos['offset'])
+                estado['huella'] = huella
+                return estado
+    return _estado_vacio(n_preguntas, n_opciones, huella)
+
+def guardar_estado(archivo_estado, estado):
+    """Guarda los acumulados de forma atómica"""
+    temporal = archivo_estado + ".tmp"
+    with open(temporal, 'wb') as f:
+        np.savez(f, **estado)
+    os.replace(temporal, archivo_estado)
+
+def acumular_lote(estado, intentos, claves):
+    """
+    Suma un lote de intentos a los acumulados con operaciones vectorizadas.
+    Para cada respuesta se usa el puntaje del resto del intento (sin la propia pregunta),
+    así la discriminación no se infla por la correlación del ítem consigo mismo.
+    """
+    ids, elegidas, intento_de = [], [], []
+    for i, intento in enumerate(intentos):
+        for id_pregunta, opcion in intento['respuestas']:
+            if 0 <= id_pregunta < len(claves):
+                ids.append(id_pregunta)
+                elegidas.append(opcion)
+                intento_de.append(i)
+    if not ids:
+        return
+
+    ids = np.array(ids, dtype=np.int64)
+    elegidas = np.array(elegidas, dtype=np.int64)
+    intento_de = np.array(intento_de, dtype=np.int64)
+
+    x = (elegidas == claves[ids]).astype(float)
+    largo = np.bincount(intento_de, minlength=len(intentos))[intento_de]
+    aciertos = np.bincount(intento_de, weights=x, minlength=len(intentos))[intento_de]
+    resto = np.where(largo > 1, (aciertos - x) / np.maximum(largo - 1, 1), 0.0)
+
+    n_preguntas = len(claves)
+    estado['n'] += np.bincount(ids, minlength=n_preguntas)
+    estado['suma_x'] += np.bincount(ids, weights=x, minlength=n_preguntas)
+    estado['suma_r'] += np.bincount(ids, weights=resto, minlength=n_preguntas)
+    estado['suma_r2'] += np.bincount(ids, weights=resto ** 2, minlength=n_preguntas)
+    estado['suma_xr'] += np.bincount(ids, weights=x * resto, minlength=n_preguntas)
+
+    respondidas = (elegidas >= 0) & (elegidas < estado['elecciones'].shape[1])
+    np.add.at(estado['elecciones'], (ids[respondidas], elegidas[respondidas]), 1)
+
+def actualizar(archivo_intentos, estado, claves, tamano_lote=5000):
+    """Procesa solo los intentos agregados al registro desde la última actualización"""
+    if not os.path.exists(archivo_intentos):
+        return 0
+    if os.path.getsize(archivo_intentos) < estado['offset']:
+        # El registro fue truncado o reemplazado: recalcular desde cero
+        estado.update(_estado_vacio(len(claves), estado['elecciones'].shape[1], estado['huella']))
+
+    nuevos = 0
+    lote = []
+    with open(archivo_intentos, 'rb') as f:
+        f.seek(estado['offset'])
+        for linea in iter(f.readline, b''):
+            if not linea.endswith(b"\n"):
+                # Línea a medio escribir: se procesa en la próxima actualización
+                break
+            estado['offset'] += len(linea)
+            if linea.strip():
+                lote.append(json.loads(linea))
+            if len(lote) >= tamano_lote:
+                acumular_lote(estado, lote, claves)
+                nuevos += len(lote)
+                lote = []
+    acumular_lote(estado, lote, claves)
+    return nuevos + len(lote)
+
+def calcular_metricas(estado, preguntas):
+    """Calcula las estadísticas clásicas de cada ítem y las marcas de revisión"""
+    n = estado['n']
+    con_datos = n > 0
+    n_seguro = np.maximum(n, 1)
+
+    p = estado['suma_x'] / n_seguro
+    media_r = estado['suma_r'] / n_seguro
+    var_r = estado['suma_r2'] / n_seguro - media_r ** 2
+    cov = estado['suma_xr'] / n_seguro - p * media_r
+    denominador = np.sqrt(np.maximum(p * (1 - p), 0) * np.maximum(var_r, 0))
+    discriminacion = np.divide(cov, denominador, out=np.zeros_like(cov), where=denominador > 1e-12)
+
+    elecciones = estado['elecciones']
+    total_elecciones = np.maximum(elecciones.sum(axis=1, keepdims=True), 1)
+    tasas = elecciones / total_elecciones
+
+    metricas = []
+    for pregunta in preguntas:
+        i = pregunta['id']
+        n_opciones = len(pregunta['opciones'])
+        item = {
+            'id': i,
+            'n': int(n[i]),
+            'p': float(p[i]) if con_datos[i] else None,
+            'discriminacion': float(discriminacion[i]) if con_datos[i] else None,
+            'tasas_opciones': [round(float(t), 4) for t in tasas[i, :n_opciones]],
+            'marcas': []
+        }
+        if item['n'] >= MIN_RESPUESTAS:
+            correcta = pregunta['correcta']
+            if item['p'] >= P_MUY_FACIL:
+                item['marcas'].append("muy fácil")
+            if item['p'] <= P_MUY_DIFICIL:
+                item['marcas'].append("muy difícil")
+            if item['discriminacion'] < MIN_DISCRIMINACION:
+                item['marcas'].append("discriminación negativa (¿clave errónea?)")
+            distractores = [j for j in range(n_opciones) if j != correcta]
+            if any(tasas[i, j] > tasas[i, correcta] for j in distractores):
+                item['marcas'].append("un distractor es más elegido que la correcta (¿clave errónea?)")
+        metricas.append(item)
+    return metricas
+
+def analizar_items(banco_id=None, archivo_intentos=None, archivo_estado=None):
+    """
+    Actualiza incrementalmente los acumulados y devuelve las métricas por pregunta.
+    Por defecto se usan el registro de intentos del banco y un estado junto a su análisis.
+    """
+    banco = obtener_banco(banco_id)
+    preguntas = banco.preguntas
+    archivo_intentos = archivo_intentos or banco.archivo_intentos
+    archivo_estado = archivo_estado or os.path.splitext(banco.archivo_analisis)[0] + ".npz"
+    if not preguntas:
+        return [], 0
+    # Claves indexadas por id; las preguntas descartadas por la validación nunca cuentan como acierto
+    claves = np.full(max(p['id'] for p in preguntas) + 1, -2, dtype=np.int64)
+    for p in preguntas:
+        claves[p['id']] = p['correcta']
+    n_opciones = max(len(p['opciones']) for p in preguntas)
+
+    estado = cargar_estado(archivo_estado, len(claves), n_opciones, _huella_claves(preguntas))
+    nuevos = actualizar(archivo_intentos, estado, claves)
+    guardar_estado(archivo_estado, estado)
+    return calcular_metricas(estado, preguntas), nuevos
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Análisis de dificultad y discriminación de las preguntas")
+    parser.add_argument("--banco", default=banco_de_entorno(), choices=list(BANCOS),
+                        help="Banco de preguntas (por defecto, el del despliegue)")
+    parser.add_argument("--intentos", default=None, help="Registro de intentos (por defecto, el del banco)")
+    parser.add_argument("--estado", default=None, help="Archivo de acumulados incrementales (por defecto, junto al análisis)")
+    parser.add_argument("--salida", default=None, help="Reporte completo por pregunta (por defecto, el análisis del banco)")
+    parser.add_argument("--reconstruir", action="store_true", help="Descartar acumulados y recalcular todo")
+    args = parser.parse_args()
+
+    banco = obtener_banco(args.banco)
+    args.salida = args.salida or banco.archivo_analisis
+    args.estado = args.estado or os.path.splitext(banco.archivo_analisis)[0] + ".npz"
+
+    if args.reconstruir and os.path.exists(args.estado):
+        os.remove(args.estado)
+
+    print("=" * 60)
+    print("🔬 ANÁLISIS DE ÍTEMS")
+    print("=" * 60)
+
+    metricas, nuevos = analizar_items(args.banco, args.intentos, args.estado)
+    if not metricas:
+        print("❌ No se pudo cargar el banco de preguntas")
+        sys.exit(1)
+
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(metricas, f, ensure_ascii=False, indent=2)
+
+    con_datos = [m for m in metricas if m['n'] >= MIN_RESPUESTAS]
+    marcadas = [m for m in metricas if m['marcas']]
+    print(f"✅ Procesados {nuevos} intentos nuevos")
+    print(f"  Preguntas con al menos {MIN_RESPUESTAS} respuestas: {len(con_datos)}/{len(metricas)}")
+    print(f"  Preguntas marcadas para revisión: {len(marcadas)}")
+
+    for m in sorted(marcadas, key=lambda m: m['discriminacion']):
+        print(f"\n  #{m['id']:4d}  p={m['p']:.2f}  rpb={m['discriminacion']:+.2f}  n={m['n']}")
+        print(f"         opciones: {', '.join(f'{t:.0%}' for t in m['tasas_opciones'])}")
+        for marca in m['marcas']:
+            print(f"         ⚠️  {marca}")
+
+    print(f"\n💾 Reporte completo guardado en: {args.salida}")
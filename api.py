@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+API HTTP/JSON de sesiones de examen
+Servidor asyncio (solo biblioteca estándar) para clientes móviles. Usa la misma
+selección y corrección que la app Streamlit, y las respuestas viajan como ids de
+pregunta e índices de opción: el cliente toma los textos del paquete estático.
+
+Endpoints:
+    POST /examenes                              {"banco", "modo", "cantidad", "categoria"}
+                                                ("banco" solo si PERMITIR_BANCO_POR_URL)
+    GET  /examenes/{sesion}/preguntas/{numero}
+    POST /examenes/{sesion}/respuestas          {"numero", "opcion"}
+    GET  /examenes/{sesion}/resultados
+"""
+
+import argparse
+import asyncio
+import json
+import secrets
+import time
+from array import array
+
+from config import TOTAL_PREGUNTAS_EXAMEN, PERMITIR_BANCO_POR_URL
+from utils import seleccionar_preguntas, calcular_estadisticas
+from bancos import obtener_banco, banco_en_memoria, banco_de_entorno, iniciar_vigilancia
+
+MAX_CUERPO = 16 * 1024
+SESION_INACTIVA_SEGUNDOS = 3 * 60 * 60
+TIMEOUT_LECTURA = 30
+
+ESTADOS_HTTP = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large"
+}
+
+class ErrorAPI(Exception):
+    """Error que se devuelve al cliente con su código HTTP"""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+class Sesion:
+    """Estado compacto de un examen: ids de las preguntas y opción elegida en cada una"""
+
+    __slots__ = ('banco', 'modo', 'preguntas', 'respuestas', 'ultimo_acceso')
+
+    def __init__(self, banco, modo, ids):
+        self.banco = banco
+        self.modo = modo
+        self.preguntas = array('l', ids)
+        self.respuestas = array('b', [-1] * len(ids))
+        self.ultimo_acceso = time.monotonic()
+
+class ServicioExamenes:
+    """Lógica de los endpoints, independiente del transporte HTTP"""
+
+    def __init__(self, banco_por_defecto):
+        self.banco_por_defecto = banco_por_defecto
+        self.sesiones = {}
+
+    def _sesion(self, sesion_id):
+        sesion = self.sesiones.get(sesion_id)
+        if sesion is None:
+            raise ErrorAPI(404, "sesión inexistente o expirada")
+        sesion.ultimo_acceso = time.monotonic()
+        return sesion
+
+    def _numero(self, sesion, numero):
+        # bool es subclase de int, pero true/false no son números de pregunta
+        if not isinstance(numero, int) or isinstance(numero, bool):
+            raise ErrorAPI(400, "numero debe ser un entero")
+        if not 1 <= numero <= len(sesion.preguntas):
+            raise ErrorAPI(404, f"la pregunta debe estar entre 1 y {len(sesion.preguntas)}")
+        return numero - 1
+
+    async def _banco(self, banco_id):
+        """
+        Banco pedido. Si no está en memoria, la carga (lectura, parseo y validación) corre
+        en un hilo para no frenar las demás conexiones del bucle.
+        """
+        try:
+            banco = banco_en_memoria(banco_id)
+            if banco is None:
+                banco = await asyncio.get_running_loop().run_in_executor(None, obtener_banco, banco_id)
+        except KeyError as e:
+            raise ErrorAPI(404, e.args[0])
+        return banco
+
+    async def crear_examen(self, datos):
+        banco_id = datos.get('banco', self.banco_por_defecto)
+        if not isinstance(banco_id, str):
+            raise ErrorAPI(400, "banco debe ser un texto")
+        # Igual que en la app: el banco es el del despliegue salvo que se habilite elegirlo
+        if banco_id != self.banco_por_defecto and not PERMITIR_BANCO_POR_URL:
+            raise ErrorAPI(403, "no está habilitado elegir el banco (PERMITIR_BANCO_POR_URL)")
+        banco = await self._banco(banco_id)
+        modo = datos.get('modo', 'examen')
+        if modo not in ('examen', 'practica'):
+            raise ErrorAPI(400, "modo debe ser 'examen' o 'practica'")
+        categoria = datos.get('categoria', 'todas')
+        if not isinstance(categoria, str):
+            raise ErrorAPI(400, "categoria debe ser un texto")
+        if categoria != 'todas' and categoria not in banco.categorias:
+            raise ErrorAPI(400, f"categoría desconocida '{categoria}'")
+        cantidad = datos.get('cantidad', TOTAL_PREGUNTAS_EXAMEN)
+        if modo == 'examen':
+            cantidad, categoria = TOTAL_PREGUNTAS_EXAMEN, 'todas'
+        if not isinstance(cantidad, int) or isinstance(cantidad, bool) or not 1 <= cantidad <= TOTAL_PREGUNTAS_EXAMEN:
+            raise ErrorAPI(400, f"cantidad debe estar entre 1 y {TOTAL_PREGUNTAS_EXAMEN}")
+
+        seleccion = seleccionar_preguntas(banco.preguntas_de(categoria), cantidad, 'todas', modo)
+        if not seleccion:
+            raise ErrorAPI(409, "no hay preguntas para esa configuración")
+
+        sesion_id = secrets.token_urlsafe(16)
+        self.sesiones[sesion_id] = Sesion(banco, modo, [p['id'] for p in seleccion])
+        return 201, {
+            'sesion': sesion_id,
+            'banco': banco.id,
+            'modo': modo,
+            'preguntas': [p['id'] for p in seleccion]
+        }
+
+    def obtener_pregunta(self, sesion_id, numero):
+        sesion = self._sesion(sesion_id)
+        i = self._numero(sesion, numero)
+        respuesta = sesion.respuestas[i]
+        return 200, {
+            'numero': numero,
+            'id': sesion.preguntas[i],
+            'opcion': respuesta if respuesta >= 0 else None
+        }
+
+    def responder(self, sesion_id, datos):
+        sesion = self._sesion(sesion_id)
+        i = self._numero(sesion, datos.get('numero'))
+        pregunta = sesion.banco.por_id[sesion.preguntas[i]]
+        opcion = datos.get('opcion')
+        if not isinstance(opcion, int) or isinstance(opcion, bool) or not 0 <= opcion < len(pregunta['opciones']):
+            raise ErrorAPI(400, f"opcion debe estar entre 0 y {len(pregunta['opciones']) - 1}")
+        if sesion.modo == 'practica' and sesion.respuestas[i] >= 0:
+            raise ErrorAPI(409, "la pregunta ya fue respondida")
+
+        sesion.respuestas[i] = opcion
+        cuerpo = {'numero': i + 1, 'id': pregunta['id'], 'opcion': opcion}
+        if sesion.modo == 'practica':
+            # En práctica hay feedback inmediato, igual que en la app
+            cuerpo['correcta'] = opcion == pregunta['correcta']
+            cuerpo['opcion_correcta'] = pregunta['correcta']
+        return 200, cuerpo
+
+    def resultados(self, sesion_id):
+        sesion = self._sesion(sesion_id)
+        respuestas = []
+        for id_pregunta, opcion in zip(sesion.preguntas, sesion.respuestas):
+            if opcion < 0:
+                continue
+            pregunta = sesion.banco.por_id[id_pregunta]
+            respuestas.append({
+                'id': id_pregunta,
+                'indice_usuario': opcion,
+                'correcta': opcion == pregunta['correcta'],
+                'categoria': pregunta.get('categoria', 'general')
+            })
+        if not respuestas:
+            raise ErrorAPI(409, "todavía no hay respuestas")
+
+        stats = calcular_estadisticas(respuestas)
+        stats['respuestas'] = [[r['id'], r['indice_usuario'], r['correcta']] for r in respuestas]
+        return 200, stats
+
+    async def despachar(self, metodo, ruta, datos):
+        """Resuelve la ruta y llama al endpoint correspondiente"""
+        partes = [p for p in ruta.split('?', 1)[0].split('/') if p]
+        if partes == ['examenes']:
+            if metodo != 'POST':
+                raise ErrorAPI(405, "usar POST")
+            return await self.crear_examen(datos)
+        if len(partes) >= 3 and partes[0] == 'examenes':
+            sesion_id, recurso = partes[1], partes[2:]
+            if recurso[0] == 'preguntas' and len(recurso) == 2 and metodo == 'GET':
+                if not recurso[1].isdigit():
+                    raise ErrorAPI(400, "número de pregunta inválido")
+                return self.obtener_pregunta(sesion_id, int(recurso[1]))
+            if recurso == ['respuestas'] and metodo == 'POST':
+                return self.responder(sesion_id, datos)
+            if recurso == ['resultados'] and metodo == 'GET':
+                return self.resultados(sesion_id)
+        raise ErrorAPI(404, "ruta inexistente")
+
+    def expirar_sesiones(self, inactividad=SESION_INACTIVA_SEGUNDOS):
+        """Elimina las sesiones sin actividad reciente"""
+        limite = time.monotonic() - inactividad
+        vencidas = [sid for sid, s in self.sesiones.items() if s.ultimo_acceso < limite]
+        for sid in vencidas:
+            del self.sesiones[sid]
+        return len(vencidas)
+
+def _respuesta_http(estado, cuerpo, mantener_conexion):
+    datos = json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+    encabezados = (
+        f"HTTP/1.1 {estado} {ESTADOS_HTTP.get(estado, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(datos)}\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        f"Connection: {'keep-alive' if mantener_conexion else 'close'}\r\n\r\n"
+    )
+    return encabezados.encode('ascii') + datos
+
+async def atender_conexion(servicio, reader, writer):
+    """Atiende una conexión HTTP/1.1 (con keep-alive) hasta que el cliente la cierre"""
+    try:
+        while True:
+            try:
+                cabecera = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), TIMEOUT_LECTURA)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError):
+                break
+
+            lineas = cabecera.decode('latin-1').split("\r\n")
+            try:
+                metodo, ruta, version = lineas[0].split(" ", 2)
+            except ValueError:
+                writer.write(_respuesta_http(400, {'error': "solicitud inválida"}, False))
+                break
+            encabezados = {}
+            for linea in lineas[1:]:
+                if ":" in linea:
+                    clave, valor = linea.split(":", 1)
+                    encabezados[clave.strip().lower()] = valor.strip()
+            mantener = encabezados.get('connection', '').lower() != 'close' and version == "HTTP/1.1"
+
+            try:
+                largo = int(encabezados.get('content-length', 0))
+                if largo > MAX_CUERPO:
+                    raise ErrorAPI(413, "cuerpo demasiado grande")
+                cuerpo = await reader.readexactly(largo) if largo else b""
+                datos = json.loads(cuerpo) if cuerpo else {}
+                if not isinstance(datos, dict):
+                    raise ErrorAPI(400, "el cuerpo debe ser un objeto JSON")
+                estado, respuesta = await servicio.despachar(metodo, ruta, datos)
+            except ErrorAPI as e:
+                estado, respuesta = e.estado, {'error': e.mensaje}
+                mantener = mantener and e.estado != 413
+            except (ValueError, UnicodeDecodeError):
+                estado, respuesta = 400, {'error': "JSON inválido"}
+
+            writer.write(_respuesta_http(estado, respuesta, mantener))
+            await writer.drain()
+            if not mantener:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def limpiar_periodicamente(servicio, intervalo=300):
+    while True:
+        await asyncio.sleep(intervalo)
+        servicio.expirar_sesiones()
+
+async def servir(banco_id, host, puerto):
+    banco = obtener_banco(banco_id)
+    if not banco.preguntas:
+        raise SystemExit(f"❌ No se pudieron cargar las preguntas de {banco.archivo}")
+    servicio = ServicioExamenes(banco_id)
+    # Las sesiones guardan la versión del banco con la que empezaron, así que recargar no las afecta
+    iniciar_vigilancia()
+
+    servidor = await asyncio.start_server(
+        lambda r, w: atender_conexion(servicio, r, w), host, puerto, backlog=1024
+    )
+    print(f"🚀 API de exámenes escuchando en http://{host}:{puerto} (banco por defecto: {banco.nombre})")
+    limpieza = asyncio.create_task(limpiar_periodicamente(servicio))
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        limpieza.cancel()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API JSON de sesiones de examen")
+    parser.add_argument("--banco", default=banco_de_entorno(), help="Banco por defecto (ver BANCOS en config.py)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(servir(args.banco, args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
@@ -1,13 +1,20 @@
 import streamlit as st
-import json
-import os
-import random
-from datetime import datetime, timedelta
-import time
+import uuid
+from datetime import datetime
 
-# Importar configuración y utilidades
-from config import *
-from utils import *
+# Importar configuración y utilidades. Los módulos que solo usan algunas páginas
+# (modo adaptativo, precarga, tablero) se importan dentro de esas páginas.
+from config import (
+    TIEMPO_EXAMEN_MINUTOS, PORCENTAJE_APROBACION, PREGUNTAS_POR_PAGINA,
+    PREGUNTAS_MIN_ADAPTATIVO, PREGUNTAS_MAX_ADAPTATIVO, ERROR_OBJETIVO_ADAPTATIVO,
+    PRECARGA_MAX_PREGUNTAS, PRECARGA_MAX_BYTES, PREGUNTAS_SIMILARES, MAX_PREGUNTAS_SESION, BANCOS, BANCO_POR_DEFECTO,
+    PERMITIR_BANCO_POR_URL, CLAVE_INSTRUCTOR, COLORS, TEXTOS
+)
+from utils import calcular_estadisticas, formatear_tiempo, generar_reporte_texto, registrar_intento, seleccionar_preguntas
+from bancos import obtener_banco, banco_de_entorno, iniciar_vigilancia
+from admision import admision, sesiones, TurnoVencido
+from fragmentos import caja_pregunta, entrada_revision
+from progreso import normalizar_usuario, cargar_progreso, registrar_progreso, bits_a_ids, contar_bits
 
 # ==========================================
 # CONFIGURACIÓN DE PÁGINA
@@ -89,6 +96,21 @@ st.markdown(f"""
         margin: 0.5rem 0;
     }}
     
+    /* Explicación de una respuesta */
+    .explicacion-box {{
+        background: rgba(59, 130, 246, 0.1);
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.5rem 0;
+    }}
+    
+    /* Pregunta incorrecta en los resultados */
+    .revision-item {{
+        border-bottom: 1px solid rgba(128, 128, 128, 0.3);
+        padding: 0.5rem 0 1rem 0;
+        margin-bottom: 1rem;
+    }}
+    
     /* Mejorar contraste de radio buttons en modo oscuro */
     .stRadio > label {{
         background: rgba(59, 130, 246, 0.05);
@@ -112,6 +134,13 @@ st.markdown(f"""
 # ==========================================
 def inicializar_estados():
     """Inicializa todos los estados de la sesión"""
+    if 'banco_id' not in st.session_state:
+        # El banco es el del despliegue; la URL (?banco=...) solo lo cambia si está habilitado
+        banco_id = banco_de_entorno()
+        if PERMITIR_BANCO_POR_URL:
+            banco_id = st.query_params.get("banco", banco_id)
+        st.session_state.banco_id = banco_id if banco_id in BANCOS else BANCO_POR_DEFECTO
+    
     if 'pagina_actual' not in st.session_state:
         st.session_state.pagina_actual = 'home'
     
@@ -135,14 +164,71 @@ def inicializar_estados():
     
     if 'con_timer' not in st.session_state:
         st.session_state.con_timer = False
+    
+    if 'intento_registrado' not in st.session_state:
+        st.session_state.intento_registrado = False
+    
+    if 'adaptativo' not in st.session_state:
+        st.session_state.adaptativo = None
+    
+    if 'preguntas_por_pagina' not in st.session_state:
+        st.session_state.preguntas_por_pagina = 1
+    
+    if 'sesion_id' not in st.session_state:
+        st.session_state.sesion_id = uuid.uuid4().hex
+    
+    if 'similares_agregados' not in st.session_state:
+        st.session_state.similares_agregados = set()
+    
+    if 'usuario' not in st.session_state:
+        st.session_state.usuario = ""
+    
+    if 'progreso' not in st.session_state:
+        st.session_state.progreso = None
 
 inicializar_estados()
 
+# Recarga los bancos en segundo plano cuando se edita su archivo (un solo hilo por proceso)
+iniciar_vigilancia()
+
+def banco_actual():
+    """Versión vigente del banco de preguntas de la sesión"""
+    return obtener_banco(st.session_state.banco_id)
+
+def banco_examen():
+    """
+    Versión del banco con la que empezó el simulacro en curso (no cambia si el banco se recarga).
+    La referencia vive con los datos pesados de la sesión: si se liberó por inactividad se usa
+    la versión vigente, que sirve igual porque los ids de las preguntas son estables.
+    """
+    return datos_sesion().get('banco_examen') or banco_actual()
+
+def datos_sesion():
+    """
+    Datos pesados de la sesión (precarga de figuras y fragmentos). Viven fuera de session_state para
+    liberarlos si la sesión queda inactiva; quien los usa los recrea si faltan.
+    """
+    return sesiones.datos(st.session_state.sesion_id)
+
+def progreso_usuario():
+    """Progreso guardado del usuario en el banco de la sesión (None si no ingresó su nombre)"""
+    usuario = normalizar_usuario(st.session_state.usuario)
+    if not usuario:
+        return None
+    clave = (st.session_state.banco_id, usuario)
+    if st.session_state.progreso is None or st.session_state.progreso[0] != clave:
+        st.session_state.progreso = (clave, cargar_progreso(*clave))
+    return st.session_state.progreso[1]
+
 # ==========================================
 # SIDEBAR - NAVEGACIÓN Y CONFIGURACIÓN
 # ==========================================
 with st.sidebar:
     st.image("imagenes/logo.png", use_container_width=True)
+    if len(BANCOS) > 1:
+        st.caption(f"🏫 {BANCOS[st.session_state.banco_id].get('nombre', st.session_state.banco_id)}")
+    st.text_input("👤 Tu nombre", key="usuario", placeholder="Para guardar tu progreso",
+                  help="Con tu nombre se recuerdan las preguntas que fallaste para repasarlas después")
     st.markdown("---")
     
     # Navegación
@@ -160,6 +246,11 @@ with st.sidebar:
         st.session_state.pagina_actual = 'estadisticas'
         st.rerun()
     
+    # El panel muestra datos de todos los alumnos: solo existe si el despliegue configuró una clave
+    if CLAVE_INSTRUCTOR and st.button("👨‍✈️ Panel del Instructor", use_container_width=True):
+        st.session_state.pagina_actual = 'instructor'
+        st.rerun()
+    
     if st.button("❓ Ayuda", use_container_width=True):
         st.session_state.pagina_actual = 'ayuda'
         st.rerun()
@@ -169,14 +260,25 @@ with st.sidebar:
     # Información durante el examen
     if st.session_state.pagina_actual == 'examen' and st.session_state.preguntas:
         st.subheader("📌 Progreso")
-        progreso = min(1.0, (st.session_state.indice + 1) / len(st.session_state.preguntas))
+        # En modo adaptativo las preguntas se agregan a medida que se responden
+        if st.session_state.modo == 'adaptativo':
+            total_preguntas = PREGUNTAS_MAX_ADAPTATIVO
+        else:
+            total_preguntas = len(st.session_state.preguntas)
+        progreso = min(1.0, (st.session_state.indice + 1) / total_preguntas)
         st.progress(progreso)
-        pregunta_actual = min(st.session_state.indice + 1, len(st.session_state.preguntas))
-        st.write(f"Pregunta {pregunta_actual} de {len(st.session_state.preguntas)}")
+        pregunta_actual = min(st.session_state.indice + 1, total_preguntas)
+        st.write(f"Pregunta {pregunta_actual} de {total_preguntas}")
         
         # Contador de respuestas
         total_respondidas = len(st.session_state.respuestas)
-        st.metric("Respondidas", f"{total_respondidas}/{len(st.session_state.preguntas)}")
+        st.metric("Respondidas", f"{total_respondidas}/{total_preguntas}")
+        
+        # Estimación de preparación en modo adaptativo
+        if st.session_state.modo == 'adaptativo' and st.session_state.adaptativo:
+            estado = st.session_state.adaptativo
+            st.metric("Preparación estimada", f"{estado['porcentaje']:.0f}%",
+                     delta=f"± {estado['margen']:.0f}%", delta_color="off")
         
         # Timer si está activado
         if st.session_state.con_timer and st.session_state.tiempo_inicio:
@@ -211,7 +313,7 @@ def mostrar_home():
     
     st.markdown(TEXTOS['descripcion_home'])
     
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     
     with col1:
         st.markdown("""
@@ -251,18 +353,57 @@ def mostrar_home():
             st.session_state.modo = 'practica'
             st.rerun()
     
+    with col3:
+        st.markdown("""
+        <div class="stat-card">
+            <h3>🧠 Modo Adaptativo</h3>
+            <p>Mide tu preparación rápidamente:</p>
+            <ul>
+                <li>Preguntas según tu nivel</li>
+                <li>Feedback inmediato</li>
+                <li>Termina cuando la estimación es estable</li>
+                <li>Porcentaje esperado en el examen real</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        if st.button("🧠 Modo Adaptativo", use_container_width=True):
+            st.session_state.pagina_actual = 'configurar'
+            st.session_state.modo = 'adaptativo'
+            st.rerun()
+    
+    st.markdown("---")
+    
+    # Repaso de las preguntas falladas en intentos anteriores
+    st.subheader("🔁 Repasar Errores")
+    progreso = progreso_usuario()
+    if progreso is None:
+        st.info("👤 Escribe tu nombre en la barra lateral para guardar tu progreso y repasar las preguntas que fallaste.")
+    else:
+        pendientes = contar_bits(progreso.pendientes & banco_actual().mascara())
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.write(f"Tienes **{pendientes}** pregunta(s) falladas sin repasar "
+                     f"(de {contar_bits(progreso.vistas)} que ya respondiste).")
+        with col2:
+            if pendientes and st.button("🔁 Repasar Errores", use_container_width=True):
+                st.session_state.pagina_actual = 'configurar'
+                st.session_state.modo = 'repaso'
+                st.rerun()
+    
     st.markdown("---")
     
     # Estadísticas globales (si existen)
     st.subheader("📊 Estadísticas Globales")
+    banco = banco_actual()
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Preguntas", "374")
+        st.metric("Total Preguntas", len(banco.preguntas))
     with col2:
-        st.metric("Preguntas con Imagen", "48")
+        st.metric("Preguntas con Imagen", banco.con_imagen)
     with col3:
-        st.metric("Categorías", len(CATEGORIAS))
+        st.metric("Categorías", len(banco.categorias))
     with col4:
         st.metric("Aprobación Requerida", f"{PORCENTAJE_APROBACION}%")
 
@@ -285,10 +426,70 @@ def mostrar_configurar():
             help="El examen real tiene un límite de 2 horas"
         )
         
+        paginado = st.checkbox(
+            f"📄 Mostrar {PREGUNTAS_POR_PAGINA} preguntas por página",
+            value=False,
+            help="Respondes una página completa y la envías de una sola vez"
+        )
+        
         st.session_state.con_timer = con_timer
+        st.session_state.preguntas_por_pagina = PREGUNTAS_POR_PAGINA if paginado else 1
         cantidad = 100
         categoria_seleccionada = "todas"
         
+    elif modo == 'adaptativo':
+        st.info("🧠 **Modo Adaptativo**: Cada pregunta se elige según tu nivel estimado")
+        
+        st.markdown(f"""
+        - Responderás entre {PREGUNTAS_MIN_ADAPTATIVO} y {PREGUNTAS_MAX_ADAPTATIVO} preguntas
+        - Si aciertas, las siguientes serán más difíciles; si fallas, más fáciles
+        - Al terminar verás el porcentaje que esperarías obtener en el examen completo
+        """)
+        
+        st.session_state.con_timer = False
+        st.session_state.preguntas_por_pagina = 1
+        cantidad = PREGUNTAS_MAX_ADAPTATIVO
+        categoria_seleccionada = "todas"
+        
+    elif modo == 'repaso':
+        st.info("🔁 **Repasar Errores**: Solo preguntas que fallaste y todavía no respondiste bien")
+        
+        banco = banco_actual()
+        progreso = progreso_usuario()
+        pendientes = progreso.pendientes if progreso else 0
+        
+        # Cantidad pendiente por categoría, cruzando los bits del progreso con los de cada categoría
+        por_categoria = {k: contar_bits(pendientes & banco.mascara(k)) for k in banco.categorias}
+        categorias_opciones = ["todas"] + [k for k, n in por_categoria.items() if n]
+        total_pendientes = sum(por_categoria.values())
+        
+        if not total_pendientes:
+            st.success("✅ No tienes preguntas pendientes de repaso")
+            cantidad = 0
+            categoria_seleccionada = "todas"
+        else:
+            col1, col2 = st.columns(2)
+            
+            with col2:
+                categoria_seleccionada = st.selectbox(
+                    "Categoría",
+                    options=categorias_opciones,
+                    format_func=lambda x: (f"📋 Todas las categorías ({total_pendientes})" if x == "todas"
+                                           else f"{banco.categorias[x]} ({por_categoria[x]})")
+                )
+            
+            with col1:
+                disponibles = total_pendientes if categoria_seleccionada == "todas" else por_categoria[categoria_seleccionada]
+                cantidad = st.slider(
+                    "Cantidad de preguntas",
+                    min_value=1,
+                    max_value=max(2, min(100, disponibles)),
+                    value=min(20, disponibles)
+                )
+        
+        st.session_state.con_timer = False
+        st.session_state.preguntas_por_pagina = 1
+        
     else:  # modo práctica
         st.info("📚 **Modo Práctica**: Personaliza tu sesión de estudio")
         
@@ -306,8 +507,9 @@ def mostrar_configurar():
             )
         
         with col2:
-            categorias_opciones = ["todas"] + list(CATEGORIAS.keys())
-            categorias_labels = ["📋 Todas las categorías"] + [CATEGORIAS[k] for k in CATEGORIAS.keys()]
+            categorias = banco_actual().categorias
+            categorias_opciones = ["todas"] + list(categorias.keys())
+            categorias_labels = ["📋 Todas las categorías"] + [categorias[k] for k in categorias.keys()]
             
             categoria_seleccionada = st.selectbox(
                 "Categoría",
@@ -316,6 +518,7 @@ def mostrar_configurar():
             )
         
         st.session_state.con_timer = False
+        st.session_state.preguntas_por_pagina = 1
     
     st.markdown("---")
     
@@ -328,35 +531,201 @@ def mostrar_configurar():
     
     with col2:
         if st.button("▶️ Comenzar", use_container_width=True, type="primary"):
-            # Cargar preguntas
-            todas_preguntas = cargar_preguntas("datos_quiz.json")
-            
-            if not todas_preguntas:
-                st.error("❌ No se pudieron cargar las preguntas")
+            # Si muchos alumnos comienzan a la vez, los inicios esperan turno en una cola
+            try:
+                with st.spinner("⏳ Muchos alumnos están comenzando a la vez, esperando turno..."):
+                    with admision.turno():
+                        comenzado = comenzar_simulacro(modo, cantidad, categoria_seleccionada)
+            except TurnoVencido:
+                st.warning("🚦 El servidor está muy ocupado. Intenta comenzar de nuevo en unos segundos.")
                 return
-            
-            # Seleccionar preguntas según configuración
-            st.session_state.preguntas = seleccionar_preguntas(
-                todas_preguntas,
-                cantidad,
-                categoria_seleccionada,
-                modo
-            )
-            
-            # Resetear estados
-            st.session_state.indice = 0
-            st.session_state.respuestas = []
-            st.session_state.respondido = False
-            
-            if st.session_state.con_timer:
-                st.session_state.tiempo_inicio = datetime.now()
-            
-            st.session_state.pagina_actual = 'examen'
-            st.rerun()
+            if comenzado:
+                st.rerun()
+
+def comenzar_simulacro(modo, cantidad, categoria_seleccionada):
+    """Carga el banco, elige las preguntas y prepara la sesión; devuelve si pudo comenzar"""
+    # Cargar preguntas
+    banco = banco_actual()
+    todas_preguntas = banco.preguntas
+    datos = datos_sesion()
+    datos.clear()
+    datos['banco_examen'] = banco
+    
+    if not todas_preguntas:
+        st.error("❌ No se pudieron cargar las preguntas")
+        return False
+    
+    if modo == 'adaptativo':
+        from adaptativo import IndiceDificultad, porcentaje_esperado
+        
+        # Se arranca con una pregunta de dificultad media; el resto se elige al responder.
+        # Las dificultades y su orden son del banco: session_state solo guarda las respuestas
+        dificultades, orden = banco.dificultades()
+        indice = datos['indice_adaptativo'] = IndiceDificultad(orden)
+        id_pregunta, dificultad = indice.extraer_cercana(0.0)
+        st.session_state.adaptativo = {
+            'respuestas': [],
+            'dificultad_actual': dificultad,
+            'habilidad': 0.0,
+            'error': 1.0,
+            'porcentaje': porcentaje_esperado(0.0, dificultades),
+            'margen': 0.0
+        }
+        st.session_state.preguntas = [banco.por_id[id_pregunta]]
+    elif modo == 'repaso':
+        st.session_state.adaptativo = None
+        progreso = progreso_usuario()
+        pendientes = progreso.pendientes & banco.mascara(categoria_seleccionada) if progreso else 0
+        st.session_state.preguntas = seleccionar_preguntas(
+            [banco.por_id[i] for i in bits_a_ids(pendientes)],
+            cantidad,
+            "todas",
+            modo
+        )
+        if not st.session_state.preguntas:
+            st.error("❌ No hay preguntas pendientes de repaso")
+            return False
+    else:
+        # Seleccionar preguntas según configuración
+        st.session_state.adaptativo = None
+        st.session_state.preguntas = seleccionar_preguntas(
+            banco.preguntas_de(categoria_seleccionada),
+            cantidad,
+            "todas",
+            modo
+        )
+    
+    # Resetear estados
+    st.session_state.indice = 0
+    st.session_state.respuestas = []
+    st.session_state.respondido = False
+    st.session_state.intento_registrado = False
+    st.session_state.similares_agregados = set()
+    
+    if st.session_state.con_timer:
+        st.session_state.tiempo_inicio = datetime.now()
+    
+    st.session_state.pagina_actual = 'examen'
+    return True
 
 # ==========================================
 # PÁGINA EXAMEN/PRÁCTICA
 # ==========================================
+def actualizar_adaptativo(es_correcta):
+    """Registra la respuesta y actualiza la habilidad y la preparación estimadas"""
+    from adaptativo import estimar_habilidad, porcentaje_esperado
+    
+    estado = st.session_state.adaptativo
+    estado['respuestas'].append((estado['dificultad_actual'], es_correcta))
+
+    habilidad, error = estimar_habilidad(estado['respuestas'])
+    estado['habilidad'] = habilidad
+    estado['error'] = error
+    dificultades, _ = banco_examen().dificultades()
+    estado['porcentaje'] = porcentaje_esperado(habilidad, dificultades)
+    estado['margen'] = (porcentaje_esperado(habilidad + error, dificultades) -
+                        porcentaje_esperado(habilidad - error, dificultades)) / 2
+
+def indice_adaptativo():
+    """
+    Índice de dificultad de la sesión. Si se liberó por inactividad se reconstruye,
+    sin las preguntas que ya salieron.
+    """
+    from adaptativo import IndiceDificultad
+    
+    datos = datos_sesion()
+    if 'indice_adaptativo' not in datos:
+        _, orden = banco_examen().dificultades()
+        datos['indice_adaptativo'] = IndiceDificultad(orden, (p['id'] for p in st.session_state.preguntas))
+    return datos['indice_adaptativo']
+
+def siguiente_adaptativo():
+    """Agrega la próxima pregunta según la habilidad estimada, salvo que la estimación ya sea estable"""
+    estado = st.session_state.adaptativo
+    respondidas = len(estado['respuestas'])
+
+    estable = respondidas >= PREGUNTAS_MIN_ADAPTATIVO and estado['error'] <= ERROR_OBJETIVO_ADAPTATIVO
+    indice = indice_adaptativo()
+    if estable or respondidas >= PREGUNTAS_MAX_ADAPTATIVO or not len(indice):
+        return
+
+    id_pregunta, dificultad = indice.extraer_cercana(estado['habilidad'])
+    estado['dificultad_actual'] = dificultad
+    st.session_state.preguntas.append(banco_examen().por_id[id_pregunta])
+
+def obtener_precargador():
+    """Precargador de la sesión, creado al mostrar la primera pregunta del simulacro"""
+    datos = datos_sesion()
+    if 'precargador' not in datos:
+        from precarga import Precargador
+        
+        datos['precargador'] = Precargador(
+            max(PRECARGA_MAX_PREGUNTAS, st.session_state.preguntas_por_pagina),
+            PRECARGA_MAX_BYTES,
+            banco_examen()
+        )
+    return datos['precargador']
+
+def mostrar_pregunta(pregunta, numero, total):
+    """Muestra la categoría, el enunciado y la imagen de una pregunta"""
+    recursos = obtener_precargador().obtener(pregunta)
+    fragmentos = recursos['fragmentos']
+    st.markdown(fragmentos['badge'] + caja_pregunta(fragmentos, numero, total), unsafe_allow_html=True)
+    
+    # Imagen si existe
+    if "imagen" in pregunta and pregunta["imagen"]:
+        if recursos['imagen'] is not None:
+            st.image(recursos['imagen'], use_container_width=True, caption="Referencia de la pregunta")
+        else:
+            st.warning("⚠️ Imagen de referencia no encontrada")
+
+def precargar_siguientes(desde):
+    """Precarga en segundo plano las preguntas que siguen mientras se responde la actual"""
+    siguientes = st.session_state.preguntas[desde:]
+    if siguientes:
+        obtener_precargador().precargar(siguientes)
+
+def registrar_respuesta(pregunta, seleccion):
+    """Guarda la respuesta elegida y devuelve si es correcta"""
+    idx_sel = pregunta["opciones"].index(seleccion)
+    es_correcta = idx_sel == pregunta["correcta"]
+    
+    st.session_state.respuestas.append({
+        'id': pregunta['id'],
+        'pregunta': pregunta['pregunta'],
+        'respuesta_usuario': seleccion,
+        'indice_usuario': idx_sel,
+        'respuesta_correcta': pregunta["opciones"][pregunta["correcta"]],
+        'correcta': es_correcta,
+        'categoria': pregunta.get('categoria', 'general'),
+        'explicacion': pregunta.get('explicacion', '')
+    })
+    return es_correcta
+
+def ofrecer_similares(pregunta, idx):
+    """Ofrece sumar a continuación preguntas parecidas que todavía no salieron en la sesión"""
+    if pregunta['id'] in st.session_state.similares_agregados:
+        return
+    en_sesion = {p['id'] for p in st.session_state.preguntas}
+    similares = [p for p in banco_examen().similares(pregunta['id']) if p['id'] not in en_sesion]
+    lugar = MAX_PREGUNTAS_SESION - len(st.session_state.preguntas)
+    similares = similares[:min(PREGUNTAS_SIMILARES, lugar)]
+    if not similares:
+        return
+    
+    if st.button(f"🔁 Practicar {len(similares)} preguntas similares", key=f"similares_{idx}",
+                 use_container_width=True):
+        st.session_state.preguntas[idx + 1:idx + 1] = similares
+        st.session_state.similares_agregados.add(pregunta['id'])
+        st.rerun()
+
+def avanzar(cantidad=1):
+    """Pasa a la siguiente pregunta (o página) o a los resultados si era la última"""
+    if st.session_state.indice + cantidad >= len(st.session_state.preguntas):
+        st.session_state.pagina_actual = 'resultados'
+    else:
+        st.session_state.indice += cantidad
+
 def mostrar_examen():
     if not st.session_state.preguntas:
         st.error("❌ No hay preguntas cargadas")
@@ -380,111 +749,107 @@ def mostrar_examen():
     # Título según modo
     if modo == 'examen':
         st.title("🎯 Examen Simulado")
+    elif modo == 'adaptativo':
+        st.title("🧠 Modo Adaptativo")
+    elif modo == 'repaso':
+        st.title("🔁 Repasar Errores")
     else:
         st.title("📚 Modo Práctica")
     
-    # Mostrar categoría (si existe)
-    categoria = pregunta.get('categoria', 'general')
-    if categoria in CATEGORIAS:
-        st.markdown(f'<div class="categoria-badge">{CATEGORIAS[categoria]}</div>', 
-                   unsafe_allow_html=True)
+    if modo == 'adaptativo':
+        total = PREGUNTAS_MAX_ADAPTATIVO
     
-    # Pregunta
-    st.markdown(f'<div class="pregunta-box"><h3>Pregunta {idx + 1} de {total}</h3><p style="font-size: 1.1rem;">{pregunta["pregunta"]}</p></div>', 
-               unsafe_allow_html=True)
-    
-    # Imagen si existe
-    if "imagen" in pregunta and pregunta["imagen"]:
-        if os.path.exists(pregunta["imagen"]):
-            st.image(pregunta["imagen"], use_container_width=True, caption="Referencia de la pregunta")
-        else:
-            st.warning("⚠️ Imagen de referencia no encontrada")
-    
-    # Opciones
-    st.markdown("### Selecciona tu respuesta:")
-    
-    # Crear un key único para cada pregunta
-    radio_key = f"pregunta_{idx}"
-    
-    seleccion = st.radio(
-        "Opciones:",
-        options=pregunta["opciones"],
-        key=radio_key,
-        disabled=st.session_state.respondido,
-        label_visibility="collapsed"
-    )
-    
-    # Lógica de respuesta según modo
-    if modo == 'practica':
-        # En modo práctica: feedback inmediato
+    # Las opciones van dentro de un formulario: elegir una opción no genera una
+    # ejecución en el servidor, solo el botón de envío
+    if modo in ('practica', 'adaptativo', 'repaso'):
+        # En modo práctica, adaptativo y repaso: feedback inmediato
+        mostrar_pregunta(pregunta, idx + 1, total)
+        st.markdown("### Selecciona tu respuesta:")
+        
+        precargar_siguientes(idx + 1)
+        
         if not st.session_state.respondido:
-            if st.button("✅ Enviar Respuesta", use_container_width=True, type="primary"):
+            with st.form(f"form_pregunta_{idx}"):
+                seleccion = st.radio(
+                    "Opciones:",
+                    options=pregunta["opciones"],
+                    key=f"pregunta_{idx}",
+                    label_visibility="collapsed"
+                )
+                enviado = st.form_submit_button("✅ Enviar Respuesta", use_container_width=True, type="primary")
+            
+            if enviado:
+                es_correcta = registrar_respuesta(pregunta, seleccion)
+                if modo == 'adaptativo':
+                    actualizar_adaptativo(es_correcta)
                 st.session_state.respondido = True
                 st.rerun()
         else:
-            # Mostrar feedback
-            idx_sel = pregunta["opciones"].index(seleccion)
-            es_correcta = idx_sel == pregunta["correcta"]
+            respuesta = st.session_state.respuestas[-1]
+            st.radio(
+                "Opciones:",
+                options=pregunta["opciones"],
+                index=respuesta['indice_usuario'],
+                key=f"pregunta_{idx}_respondida",
+                disabled=True,
+                label_visibility="collapsed"
+            )
             
-            if es_correcta:
+            # Mostrar feedback
+            if respuesta['correcta']:
                 st.success("✅ ¡Correcto!")
             else:
-                correcta_txt = pregunta["opciones"][pregunta["correcta"]]
-                st.error(f"❌ Incorrecto. La respuesta correcta es: **{correcta_txt}**")
+                st.error(f"❌ Incorrecto. La respuesta correcta es: **{respuesta['respuesta_correcta']}**")
+                if modo in ('practica', 'repaso'):
+                    ofrecer_similares(pregunta, idx)
             
             # Mostrar explicación si existe
-            if pregunta.get("explicacion"):
+            explicacion = banco_examen().fragmentos(pregunta)['explicacion']
+            if explicacion:
                 with st.expander("📖 Ver explicación"):
-                    st.info(pregunta["explicacion"])
-            
-            # Guardar respuesta
-            if len(st.session_state.respuestas) <= idx:
-                st.session_state.respuestas.append({
-                    'pregunta': pregunta['pregunta'],
-                    'respuesta_usuario': seleccion,
-                    'respuesta_correcta': pregunta["opciones"][pregunta["correcta"]],
-                    'correcta': es_correcta,
-                    'categoria': categoria,
-                    'explicacion': pregunta.get('explicacion', '')
-                })
+                    st.markdown(explicacion, unsafe_allow_html=True)
             
             # Botón siguiente
             col1, col2 = st.columns([1, 1])
             with col2:
                 if st.button("➡️ Siguiente Pregunta", use_container_width=True, type="primary"):
-                    # Verificar si era la última pregunta
-                    if st.session_state.indice >= len(st.session_state.preguntas) - 1:
-                        # Era la última, ir a resultados
-                        st.session_state.pagina_actual = 'resultados'
-                    else:
-                        # Hay más preguntas
-                        st.session_state.indice += 1
+                    if modo == 'adaptativo':
+                        siguiente_adaptativo()
+                    avanzar()
                     st.session_state.respondido = False
                     st.rerun()
     
     else:  # modo examen
-        # En modo examen: sin feedback, solo avanzar
-        if st.button("➡️ Siguiente Pregunta", use_container_width=True, type="primary"):
-            # Guardar respuesta
-            idx_sel = pregunta["opciones"].index(seleccion)
-            es_correcta = idx_sel == pregunta["correcta"]
-            
-            st.session_state.respuestas.append({
-                'pregunta': pregunta['pregunta'],
-                'respuesta_usuario': seleccion,
-                'respuesta_correcta': pregunta["opciones"][pregunta["correcta"]],
-                'correcta': es_correcta,
-                'categoria': categoria,
-                'explicacion': pregunta.get('explicacion', '')
-            })
+        # En modo examen: sin feedback, se envía la página completa (1 o más preguntas)
+        por_pagina = st.session_state.preguntas_por_pagina
+        pagina = st.session_state.preguntas[idx:idx + por_pagina]
+        ultima_pagina = idx + por_pagina >= total
+        
+        with st.form(f"form_pagina_{idx}"):
+            selecciones = []
+            for i, pregunta in enumerate(pagina):
+                mostrar_pregunta(pregunta, idx + i + 1, total)
+                st.markdown("### Selecciona tu respuesta:")
+                selecciones.append(st.radio(
+                    "Opciones:",
+                    options=pregunta["opciones"],
+                    key=f"pregunta_{idx + i}",
+                    label_visibility="collapsed"
+                ))
+            precargar_siguientes(idx + por_pagina)
             
-            # Verificar si era la última pregunta
-            if st.session_state.indice >= len(st.session_state.preguntas) - 1:
-                # Era la última, ir a resultados
-                st.session_state.pagina_actual = 'resultados'
+            if ultima_pagina:
+                etiqueta = "🏁 Finalizar Examen"
+            elif por_pagina > 1:
+                etiqueta = "➡️ Siguiente Página"
             else:
-                # Hay más preguntas
-                st.session_state.indice += 1
+                etiqueta = "➡️ Siguiente Pregunta"
+            enviado = st.form_submit_button(etiqueta, use_container_width=True, type="primary")
+        
+        if enviado:
+            for pregunta, seleccion in zip(pagina, selecciones):
+                registrar_respuesta(pregunta, seleccion)
+            avanzar(len(pagina))
             st.rerun()
 
 # ==========================================
@@ -500,6 +865,21 @@ def mostrar_resultados():
     
     stats = calcular_estadisticas(st.session_state.respuestas)
     
+    # Registrar el intento una sola vez para el análisis de ítems
+    if not st.session_state.intento_registrado:
+        from cohorte import registrar_en_tablero
+        
+        registrar_intento(st.session_state.respuestas, banco_examen().archivo_intentos)
+        usuario = normalizar_usuario(st.session_state.usuario)
+        registrar_en_tablero(banco_examen().archivo_cohorte, stats, st.session_state.respuestas,
+                             st.session_state.modo, usuario)
+        if usuario:
+            banco_id = banco_examen().id
+            progreso = registrar_progreso(banco_id, usuario,
+                                          [(r['id'], r['correcta']) for r in st.session_state.respuestas])
+            st.session_state.progreso = ((banco_id, usuario), progreso)
+        st.session_state.intento_registrado = True
+    
     # Animación de globos si aprobó
     if stats['aprobado']:
         st.balloons()
@@ -527,12 +907,30 @@ def mostrar_resultados():
                  delta_color=color_delta)
     
     st.markdown("---")
-    
+
+    # Preparación estimada (modo adaptativo)
+    if st.session_state.modo == 'adaptativo' and st.session_state.adaptativo:
+        estado = st.session_state.adaptativo
+        st.subheader("🧠 Preparación Estimada")
+        st.metric(
+            "Porcentaje esperado en el examen completo",
+            f"{estado['porcentaje']:.0f}% ± {estado['margen']:.0f}%",
+            delta=f"{estado['porcentaje'] - PORCENTAJE_APROBACION:.1f}%",
+            delta_color="normal" if estado['porcentaje'] >= PORCENTAJE_APROBACION else "inverse"
+        )
+        if estado['porcentaje'] - estado['margen'] >= PORCENTAJE_APROBACION:
+            st.success("✅ Con tu nivel actual es muy probable que apruebes el examen real.")
+        elif estado['porcentaje'] + estado['margen'] < PORCENTAJE_APROBACION:
+            st.warning("📚 Todavía no alcanzas el nivel de aprobación. Sigue practicando.")
+        else:
+            st.info("⚖️ Estás cerca del límite de aprobación. Un simulacro completo te dará más certeza.")
+        st.markdown("---")
+
     # Resultados por categoría
     st.subheader("📊 Resultados por Categoría")
     
     for cat, data in stats['por_categoria'].items():
-        cat_nombre = CATEGORIAS.get(cat, cat)
+        cat_nombre = banco_examen().categorias.get(cat, cat)
         porcentaje = data['porcentaje']
         
         col1, col2 = st.columns([3, 1])
@@ -550,14 +948,13 @@ def mostrar_resultados():
     # Preguntas incorrectas
     if stats['incorrectas'] > 0:
         with st.expander(f"❌ Ver {stats['incorrectas']} pregunta(s) incorrecta(s)"):
-            for idx, r in enumerate(st.session_state.respuestas):
-                if not r['correcta']:
-                    st.markdown(f"**{idx + 1}. {r['pregunta']}**")
-                    st.markdown(f"- Tu respuesta: ❌ {r['respuesta_usuario']}")
-                    st.markdown(f"- Respuesta correcta: ✅ {r['respuesta_correcta']}")
-                    if r.get('explicacion'):
-                        st.info(f"📖 {r['explicacion']}")
-                    st.markdown("---")
+            # Todas las entradas en un solo bloque, armado con los fragmentos del banco
+            banco = banco_examen()
+            preguntas = {p['id']: p for p in st.session_state.preguntas}
+            st.markdown("".join(
+                entrada_revision(banco.fragmentos(preguntas[r['id']]), idx + 1, r['indice_usuario'])
+                for idx, r in enumerate(st.session_state.respuestas) if not r['correcta']
+            ), unsafe_allow_html=True)
     
     # Botones de acción
     col1, col2, col3 = st.columns(3)
@@ -606,6 +1003,12 @@ def mostrar_ayuda():
     4. Puedes ver explicaciones detalladas
     5. Ideal para repasar temas específicos
     
+    ### 🔁 Repasar Errores
+    1. Escribe tu nombre en la barra lateral antes de empezar
+    2. Cada simulacro que termines suma a tu progreso
+    3. El repaso incluye solo las preguntas que fallaste y todavía no respondiste bien
+    4. Al acertarlas salen del repaso; si vuelves a fallarlas, vuelven a entrar
+    
     ## 📋 Requisitos del Examen Real
     - **Preguntas**: 100 preguntas de selección múltiple
     - **Tiempo**: 2 horas máximo
@@ -651,6 +1054,122 @@ def mostrar_estadisticas():
         st.session_state.pagina_actual = 'home'
         st.rerun()
 
+# ==========================================
+# PÁGINA PANEL DEL INSTRUCTOR
+# ==========================================
+def instructor_autorizado():
+    """Pide la clave del instructor una vez por sesión; devuelve si ya se ingresó"""
+    import hmac
+    
+    if st.session_state.get('instructor_autorizado'):
+        return True
+    if not CLAVE_INSTRUCTOR:
+        st.error("🔒 El panel del instructor no está habilitado en este despliegue")
+        return False
+    
+    with st.form("clave_instructor"):
+        clave = st.text_input("Clave del instructor", type="password")
+        ingresar = st.form_submit_button("🔓 Ingresar")
+    if ingresar:
+        if hmac.compare_digest(clave.encode('utf-8'), CLAVE_INSTRUCTOR.encode('utf-8')):
+            st.session_state.instructor_autorizado = True
+            st.rerun()
+        st.error("❌ Clave incorrecta")
+    return False
+
+def mostrar_instructor():
+    from cohorte import leer_tablero, MIN_RESPUESTAS_DIFICIL
+    
+    st.title("👨‍✈️ Panel del Instructor")
+    if not instructor_autorizado():
+        return
+    banco = banco_actual()
+    st.caption(f"Resultados de todos los alumnos en {banco.nombre}")
+    
+    # Cola de inicios de simulacro y sesiones de este servidor
+    metricas = admision.metricas()
+    with st.expander(f"🚦 Carga del servidor: {metricas['en_cola']} en cola, {len(sesiones)} sesiones activas"):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("En cola ahora", metricas['en_cola'], help=f"Máximo registrado: {metricas['max_en_cola']}")
+        with col2:
+            st.metric("Espera promedio", f"{metricas['espera_media']:.1f} s",
+                     help=f"p95: {metricas['espera_p95']:.1f} s · máxima: {metricas['espera_max']:.1f} s")
+        with col3:
+            st.metric("Inicios admitidos", metricas['admitidos'],
+                     help=f"Rechazados por esperar más de {admision.espera_maxima:.0f} s: {metricas['rechazados']}")
+        with col4:
+            st.metric("Sesiones activas", len(sesiones),
+                     help=f"Sesiones inactivas liberadas: {sesiones.liberadas}")
+    
+    # Las tablas ya vienen agregadas: el panel solo lee un resumen
+    tablero = leer_tablero(banco.archivo_cohorte)
+    if not tablero['intentos']:
+        st.info("📭 Todavía no hay intentos terminados en este banco")
+        return
+    
+    por_modo = tablero['por_modo']
+    examenes = por_modo.get('examen', {'intentos': 0, 'aprobados': 0, 'suma_porcentaje': 0.0})
+    suma = sum(m['suma_porcentaje'] for m in por_modo.values())
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Intentos", tablero['intentos'])
+    with col2:
+        st.metric("Alumnos identificados", tablero['usuarios'])
+    with col3:
+        st.metric("Puntaje Promedio", f"{suma / tablero['intentos']:.1f}%")
+    with col4:
+        if examenes['intentos']:
+            st.metric("Aprobación en Simulacros", f"{examenes['aprobados'] / examenes['intentos'] * 100:.0f}%",
+                     help=f"Simulacros completos con {PORCENTAJE_APROBACION}% o más")
+        else:
+            st.metric("Aprobación en Simulacros", "—")
+    
+    st.markdown("---")
+    
+    # Resultados por modo
+    st.subheader("🎯 Por Modo")
+    nombres_modo = {'examen': "🎯 Examen", 'practica': "📚 Práctica", 'adaptativo': "🧠 Adaptativo",
+                    'repaso': "🔁 Repaso de errores"}
+    for modo, datos in por_modo.items():
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            st.write(f"**{nombres_modo.get(modo, modo)}**")
+        with col2:
+            st.write(f"{datos['intentos']} intento(s), promedio {datos['suma_porcentaje'] / datos['intentos']:.0f}%")
+        with col3:
+            st.write(f"✅ {datos['aprobados'] / datos['intentos'] * 100:.0f}% aprobados")
+    
+    st.markdown("---")
+    
+    # Promedio por categoría
+    st.subheader("📊 Promedio por Categoría")
+    for cat, datos in sorted(tablero['por_categoria'].items(),
+                             key=lambda item: item[1]['suma_porcentaje'] / item[1]['intentos']):
+        porcentaje = datos['suma_porcentaje'] / datos['intentos']
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.write(f"**{banco.categorias.get(cat, cat)}**")
+            st.progress(porcentaje / 100)
+        with col2:
+            color = "🟢" if porcentaje >= 80 else "🟡" if porcentaje >= 60 else "🔴"
+            st.write(f"{color} {porcentaje:.0f}% ({datos['respuestas']} respuestas)")
+    
+    st.markdown("---")
+    
+    # Preguntas más difíciles
+    st.subheader("🧩 Preguntas Más Difíciles")
+    if not tablero['mas_dificiles']:
+        st.info(f"Se muestran cuando una pregunta tiene al menos {MIN_RESPUESTAS_DIFICIL} respuestas")
+    for id_pregunta, respuestas, correctas in tablero['mas_dificiles']:
+        pregunta = banco.por_id.get(id_pregunta)
+        if pregunta is None:
+            continue
+        st.markdown(f"**{correctas / respuestas * 100:.0f}% de aciertos** ({respuestas} respuestas) — "
+                    f"{pregunta['pregunta']}")
+        st.caption(f"✅ {pregunta['opciones'][pregunta['correcta']]}")
+
 # ==========================================
 # ROUTER PRINCIPAL
 # ==========================================
@@ -669,6 +1188,8 @@ def main():
         mostrar_ayuda()
     elif pagina == 'estadisticas':
         mostrar_estadisticas()
+    elif pagina == 'instructor':
+        mostrar_instructor()
     else:
         mostrar_home()
 
@@ -0,0 +1,244 @@
+# bancos.py - Bancos de preguntas por escuela, con cache LRU acotada y recarga en caliente
+
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional
+
+from config import BANCOS, BANCO_POR_DEFECTO, MAX_BANCOS_EN_MEMORIA, CATEGORIAS, INTERVALO_RECARGA_SEGUNDOS
+from utils import cargar_preguntas
+from progreso import ids_a_bits
+from fragmentos import armar_fragmentos
+
+# Bytes de figuras que cada banco mantiene en memoria
+MAX_BYTES_IMAGENES_POR_BANCO = 16 * 1024 * 1024
+
+_versiones = itertools.count(1)
+
+def firma_archivo(archivo: str):
+    """Identifica el contenido actual del archivo sin leerlo (None si no existe)"""
+    try:
+        estado = os.stat(archivo)
+    except OSError:
+        return None
+    return (estado.st_mtime_ns, estado.st_size)
+
+class Banco:
+    """
+    Una versión cargada de un banco: preguntas, índices y cache de figuras.
+    Es inmutable: una recarga crea otra instancia, y quien ya tenía esta la sigue usando.
+    """
+
+    def __init__(self, banco_id: str, configuracion: Dict):
+        self.id = banco_id
+        self.nombre = configuracion.get('nombre', banco_id)
+        self.archivo = configuracion['archivo']
+        self.version = next(_versiones)
+        # La firma se toma antes de leer: si el archivo cambia durante la carga, se recarga de nuevo
+        self.firma = firma_archivo(self.archivo)
+        self.categorias = configuracion.get('categorias', CATEGORIAS)
+
+        # Registro de intentos y análisis de ítems propios: los ids solo valen dentro de un banco
+        sufijo = "" if banco_id == BANCO_POR_DEFECTO else f"_{banco_id}"
+        self.archivo_intentos = configuracion.get('intentos', f"intentos{sufijo}.jsonl")
+        self.archivo_analisis = configuracion.get('analisis', f"analisis_items{sufijo}.json")
+        self.archivo_cohorte = configuracion.get('cohorte', f"cohorte{sufijo}.json")
+        self.archivo_similares = configuracion.get('similares', os.path.splitext(self.archivo)[0] + "_similares.npz")
+
+        self.preguntas = cargar_preguntas(self.archivo, self.categorias, configuracion.get('imagenes', ""))
+        self.por_id = {p['id']: p for p in self.preguntas}
+        self.por_categoria = {}
+        for p in self.preguntas:
+            self.por_categoria.setdefault(p.get('categoria', 'general'), []).append(p)
+        self.con_imagen = sum(1 for p in self.preguntas if p.get('imagen'))
+
+        self._imagenes = OrderedDict()
+        self._bytes_imagenes = 0
+        self._lock = threading.Lock()
+        self._lock_vecinos = threading.Lock()
+        self._vecinos = None
+        self._mascaras = {}
+        self._dificultades = None
+        self._fragmentos = {}
+
+    def preguntas_de(self, categoria: str = "todas") -> List[Dict]:
+        """Preguntas de una categoría (o todas) sin recorrer el banco completo"""
+        if not categoria or categoria == "todas":
+            return self.preguntas
+        return self.por_categoria.get(categoria, [])
+
+    def fragmentos(self, pregunta: Dict) -> Dict:
+        """
+        Fragmentos HTML de una pregunta (ver fragmentos.py), armados la primera vez que se
+        piden. Se usa el texto de esta versión del banco; si la pregunta ya no está en ella
+        (sesión que empezó antes de una recarga), el de la pregunta recibida.
+        """
+        id_pregunta = pregunta['id']
+        fragmentos = self._fragmentos.get(id_pregunta)
+        if fragmentos is None:
+            fragmentos = self._fragmentos[id_pregunta] = armar_fragmentos(
+                self.por_id.get(id_pregunta, pregunta), self.categorias
+            )
+        return fragmentos
+
+    def mascara(self, categoria: str = "todas") -> int:
+        """Ids de una categoría (o de todo el banco) como conjunto de bits, para cruzarlos con el progreso"""
+        if categoria not in self._mascaras:
+            self._mascaras[categoria] = ids_a_bits(p['id'] for p in self.preguntas_de(categoria))
+        return self._mascaras[categoria]
+
+    def dificultades(self):
+        """
+        Dificultad estimada de cada pregunta y su orden (ver adaptativo.py), compartidos por
+        todas las sesiones del modo adaptativo. Se recalculan si cambia el análisis de ítems.
+        """
+        from adaptativo import estimar_dificultades, IndiceDificultad
+
+        firma = firma_archivo(self.archivo_analisis)
+        calculadas = self._dificultades
+        if calculadas is None or calculadas[0] != firma:
+            dificultades = estimar_dificultades(self.preguntas, self.archivo_analisis)
+            calculadas = self._dificultades = (firma, dificultades, IndiceDificultad.ordenar(self.preguntas, dificultades))
+        return calculadas[1], calculadas[2]
+
+    def preparar_similares(self):
+        """
+        Carga la tabla de preguntas similares (ver similares.py). Si falta o no corresponde
+        a esta versión del banco se recalcula y se guarda; si no se puede guardar, queda
+        solo en memoria.
+        """
+        from similares import cargar_tabla, generar_tabla, calcular_vecinos, TablaVecinos
+
+        with self._lock_vecinos:
+            if self._vecinos is not None:
+                return
+            tabla = cargar_tabla(self.archivo_similares, self.preguntas)
+            if tabla is None and self.preguntas:
+                print(f"⚠️ La tabla de similares de '{self.id}' falta o no corresponde al banco; se recalcula")
+                try:
+                    vecinos, _ = generar_tabla(self.preguntas, self.archivo_similares)
+                except OSError:
+                    vecinos, _ = calcular_vecinos(self.preguntas)
+                tabla = TablaVecinos([p['id'] for p in self.preguntas], vecinos)
+            self._vecinos = tabla or False
+
+    def similares(self, id_pregunta: int) -> List[Dict]:
+        """Preguntas más parecidas según la tabla de vecinos, que se prepara al primer uso"""
+        if self._vecinos is None:
+            self.preparar_similares()
+        if not self._vecinos:
+            return []
+        return [self.por_id[i] for i in self._vecinos.vecinos_de(id_pregunta) if i in self.por_id]
+
+    def leer_imagen(self, ruta: str) -> Optional[bytes]:
+        """Bytes de una figura del banco, con LRU acotada por tamaño; None si no existe"""
+        with self._lock:
+            if ruta in self._imagenes:
+                self._imagenes.move_to_end(ruta)
+                return self._imagenes[ruta]
+
+        if not os.path.exists(ruta):
+            return None
+        with open(ruta, 'rb') as f:
+            datos = f.read()
+
+        with self._lock:
+            if ruta not in self._imagenes:
+                self._imagenes[ruta] = datos
+                self._bytes_imagenes += len(datos)
+            while self._bytes_imagenes > MAX_BYTES_IMAGENES_POR_BANCO and len(self._imagenes) > 1:
+                _, descartada = self._imagenes.popitem(last=False)
+                self._bytes_imagenes -= len(descartada)
+        return datos
+
+_cargados = OrderedDict()
+_lock = threading.Lock()
+# Firma del último archivo inválido de cada banco, para no reintentar hasta que vuelva a cambiar
+_firmas_descartadas = {}
+_vigilante = None
+
+def banco_en_memoria(banco_id: str = None) -> Optional[Banco]:
+    """Devuelve el banco si ya está cargado, sin cargarlo (None si no está en memoria)"""
+    banco_id = banco_id or BANCO_POR_DEFECTO
+    with _lock:
+        banco = _cargados.get(banco_id)
+        if banco is not None:
+            _cargados.move_to_end(banco_id)
+        return banco
+
+def obtener_banco(banco_id: str = None) -> Banco:
+    """
+    Devuelve el banco pedido, cargándolo si hace falta. Solo se mantienen en memoria los
+    MAX_BANCOS_EN_MEMORIA usados más recientemente; las sesiones en curso conservan su
+    referencia aunque el banco salga de la cache.
+    """
+    banco_id = banco_id or BANCO_POR_DEFECTO
+    if banco_id not in BANCOS:
+        raise KeyError(f"banco desconocido '{banco_id}'")
+
+    with _lock:
+        banco = _cargados.get(banco_id)
+        if banco is not None:
+            _cargados.move_to_end(banco_id)
+            return banco
+
+    # La carga se hace fuera del lock para no frenar a los demás bancos
+    banco = Banco(banco_id, BANCOS[banco_id])
+
+    with _lock:
+        banco = _cargados.setdefault(banco_id, banco)
+        _cargados.move_to_end(banco_id)
+        while len(_cargados) > MAX_BANCOS_EN_MEMORIA:
+            _cargados.popitem(last=False)
+    return banco
+
+def recargar_modificados() -> List[str]:
+    """
+    Vuelve a cargar (parseo y validación incluidos) los bancos en memoria cuyo archivo cambió
+    y los reemplaza de forma atómica. Si la nueva versión no tiene preguntas válidas se
+    conserva la anterior. Devuelve los ids recargados.
+    """
+    with _lock:
+        candidatos = [b for b in _cargados.values() if firma_archivo(b.archivo) != b.firma]
+
+    recargados = []
+    for anterior in candidatos:
+        firma = firma_archivo(anterior.archivo)
+        if firma is None or firma == _firmas_descartadas.get(anterior.id):
+            continue
+        nuevo = Banco(anterior.id, BANCOS[anterior.id])
+        if not nuevo.preguntas:
+            # Archivo a medio escribir o inválido: se reintenta cuando vuelva a cambiar
+            _firmas_descartadas[anterior.id] = firma
+            continue
+        # Si cambiaron textos, la tabla de similares se recalcula acá y no en la primera sesión
+        nuevo.preparar_similares()
+        with _lock:
+            # Solo se reemplaza si nadie lo cambió mientras tanto (p. ej. expulsado de la LRU)
+            if _cargados.get(anterior.id) is anterior:
+                _cargados[anterior.id] = nuevo
+                recargados.append(anterior.id)
+        _firmas_descartadas.pop(anterior.id, None)
+    return recargados
+
+def _vigilar(intervalo: float):
+    while True:
+        time.sleep(intervalo)
+        try:
+            recargar_modificados()
+        except Exception as e:  # El vigilante no debe morir por un banco roto
+            print(f"⚠️ Error al recargar bancos: {e}")
+
+def iniciar_vigilancia(intervalo: float = INTERVALO_RECARGA_SEGUNDOS):
+    """Arranca (una sola vez por proceso) el hilo que recarga los bancos modificados"""
+    global _vigilante
+    with _lock:
+        if _vigilante is None:
+            _vigilante = threading.Thread(target=_vigilar, args=(intervalo,), name="recarga-bancos", daemon=True)
+            _vigilante.start()
+
+def banco_de_entorno() -> str:
+    """Banco configurado para este despliegue"""
+    return os.environ.get("QUIZ_BANCO", BANCO_POR_DEFECTO)
@@ -0,0 +1,230 @@
+# cohorte.py - Tablero del instructor: agregados de todos los intentos, actualizados al terminar cada uno
+
+import hashlib
+import json
+import os
+import threading
+from bisect import bisect_left, insort
+from typing import List, Dict, Optional
+
+from config import PORCENTAJE_APROBACION
+from progreso import bloqueo_archivo
+
+# Respuestas mínimas para que una pregunta cuente entre las más difíciles
+MIN_RESPUESTAS_DIFICIL = 10
+PREGUNTAS_DIFICILES = 10
+# Intentos que se acumulan en el diario antes de reescribir el tablero completo
+COMPACTAR_CADA = 200
+
+_lock = threading.Lock()
+# Tablero en memoria de cada archivo
+_tableros = {}
+
+def _firma(archivo: str):
+    try:
+        estado = os.stat(archivo)
+    except OSError:
+        return None
+    return (estado.st_mtime_ns, estado.st_size)
+
+def huella_usuario(usuario: str) -> int:
+    """Los alumnos se cuentan por huella: el tablero no guarda nombres"""
+    return int.from_bytes(hashlib.blake2b(usuario.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def resumir_intento(stats: Dict, respuestas: List[Dict], modo: str, usuario: Optional[str] = None) -> Dict:
+    """Lo que suma un intento terminado (stats de calcular_estadisticas): una línea del diario"""
+    return {
+        'modo': modo,
+        'porcentaje': stats['porcentaje'],
+        'categorias': {cat: [d['porcentaje'], d['total'], d['correctas']] for cat, d in stats['por_categoria'].items()},
+        'respuestas': [[r['id'], int(r['correcta'])] for r in respuestas],
+        'usuario': huella_usuario(usuario) if usuario else None
+    }
+
+class Tablero:
+    """
+    Agregados de un banco. En disco hay una foto completa (archivo) y un diario con una
+    línea por intento posterior: registrar un intento solo agrega una línea, y la foto se
+    reescribe cada COMPACTAR_CADA intentos. Las preguntas con suficientes respuestas se
+    mantienen ordenadas por tasa de acierto, así las más difíciles salen sin recorrerlas.
+    Leer, agregar y compactar se hace con el archivo bloqueado: varios procesos pueden
+    compartir el mismo tablero.
+    """
+
+    def __init__(self, archivo: str):
+        self.archivo = archivo
+        self._vaciar()
+
+    def _vaciar(self):
+        self.generacion = 0
+        self.intentos = 0
+        self.usuarios = set()
+        self.por_modo = {}
+        self.por_categoria = {}
+        self.por_pregunta = {}
+        self._orden = []  # (tasa de acierto, -respuestas, id) de las preguntas elegibles
+        self.firma = None
+        self.leido = 0  # Bytes del diario ya aplicados
+        self.en_diario = 0
+
+    @property
+    def diario(self) -> str:
+        return f"{os.path.splitext(self.archivo)[0]}.{self.generacion}.jsonl"
+
+    @staticmethod
+    def _clave(id_pregunta: int, conteo: List[int]):
+        return (conteo[1] / conteo[0], -conteo[0], id_pregunta)
+
+    def aplicar(self, intento: Dict):
+        """Suma un intento resumido; cuesta lo mismo sin importar cuántos hay acumulados"""
+        self.intentos += 1
+        if intento['usuario'] is not None:
+            self.usuarios.add(intento['usuario'])
+
+        porcentaje = intento['porcentaje']
+        fila = self.por_modo.setdefault(intento['modo'], {'intentos': 0, 'aprobados': 0, 'suma_porcentaje': 0.0})
+        fila['intentos'] += 1
+        fila['aprobados'] += int(porcentaje >= PORCENTAJE_APROBACION)
+        fila['suma_porcentaje'] += porcentaje
+
+        for cat, (porcentaje_cat, total, correctas) in intento['categorias'].items():
+            fila = self.por_categoria.setdefault(
+                cat, {'intentos': 0, 'suma_porcentaje': 0.0, 'respuestas': 0, 'correctas': 0}
+            )
+            fila['intentos'] += 1
+            fila['suma_porcentaje'] += porcentaje_cat
+            fila['respuestas'] += total
+            fila['correctas'] += correctas
+
+        for id_pregunta, correcta in intento['respuestas']:
+            conteo = self.por_pregunta.setdefault(id_pregunta, [0, 0])
+            if conteo[0] >= MIN_RESPUESTAS_DIFICIL:
+                del self._orden[bisect_left(self._orden, self._clave(id_pregunta, conteo))]
+            conteo[0] += 1
+            conteo[1] += correcta
+            if conteo[0] >= MIN_RESPUESTAS_DIFICIL:
+                insort(self._orden, self._clave(id_pregunta, conteo))
+
+    def mas_dificiles(self) -> List[List[int]]:
+        return [[i, -n, self.por_pregunta[i][1]] for _, n, i in self._orden[:PREGUNTAS_DIFICILES]]
+
+    def _cargar_foto(self):
+        self._vaciar()
+        self.firma = _firma(self.archivo)
+        if self.firma is None:
+            return
+        try:
+            with open(self.archivo, 'r', encoding='utf-8') as f:
+                foto = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        # Los tableros de antes del diario no tienen generación y guardaban los nombres
+        self.generacion = foto.get('generacion', 0)
+        self.intentos = foto['intentos']
+        self.usuarios = {u if isinstance(u, int) else huella_usuario(u) for u in foto['usuarios']}
+        self.por_modo = foto['por_modo']
+        self.por_categoria = foto['por_categoria']
+        # Las claves de JSON son texto: los ids se guardan como str
+        self.por_pregunta = {int(i): conteo for i, conteo in foto['por_pregunta'].items()}
+        self._orden = sorted(self._clave(i, c) for i, c in self.por_pregunta.items() if c[0] >= MIN_RESPUESTAS_DIFICIL)
+
+    def sincronizar(self):
+        """Se pone al día con lo que haya en disco: foto nueva o líneas nuevas del diario"""
+        with bloqueo_archivo(self.archivo):
+            self._sincronizar()
+
+    def _sincronizar(self):
+        if _firma(self.archivo) != self.firma:
+            self._cargar_foto()
+        try:
+            with open(self.diario, 'rb') as f:
+                f.seek(self.leido)
+                nuevo = f.read()
+        except OSError:
+            return
+        # Solo líneas completas: la última puede estar escribiéndose
+        completo = nuevo[:nuevo.rfind(b"\n") + 1]
+        for linea in completo.splitlines():
+            if not linea.strip():
+                continue
+            try:
+                intento = json.loads(linea)
+            except ValueError:
+                # Línea dañada (p. ej. un corte a mitad de escritura): se saltea, no traba el tablero
+                print(f"⚠️ Línea inválida en {self.diario}, se omite")
+                continue
+            self.aplicar(intento)
+            self.en_diario += 1
+        self.leido += len(completo)
+
+    def registrar(self, intento: Dict):
+        linea = (json.dumps(intento, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+        with bloqueo_archivo(self.archivo):
+            self._sincronizar()
+            with open(self.diario, 'ab') as f:
+                f.write(linea)
+                self.leido = f.tell()
+            self.aplicar(intento)
+            self.en_diario += 1
+            if self.en_diario >= COMPACTAR_CADA:
+                self._compactar()
+
+    def _compactar(self):
+        """
+        Reescribe la foto con todo lo acumulado y pasa a un diario nuevo. La foto dice qué
+        diario le sigue, así un corte entre los dos pasos no cuenta dos veces ningún intento.
+        """
+        anterior = self.diario
+        self.generacion += 1
+        foto = {
+            'generacion': self.generacion,
+            'intentos': self.intentos,
+            'usuarios': sorted(self.usuarios),
+            'por_modo': self.por_modo,
+            'por_categoria': self.por_categoria,
+            'por_pregunta': {str(i): c for i, c in self.por_pregunta.items()}
+        }
+        temporal = f"{self.archivo}.{os.getpid()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(foto, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temporal, self.archivo)
+        self.firma = _firma(self.archivo)
+        self.leido = 0
+        self.en_diario = 0
+        try:
+            os.remove(anterior)
+        except OSError:
+            pass
+
+    def resumen(self) -> Dict:
+        """Copia de lo que muestra el panel (sin los conteos por pregunta)"""
+        return {
+            'intentos': self.intentos,
+            'usuarios': len(self.usuarios),
+            'por_modo': {m: dict(f) for m, f in self.por_modo.items()},
+            'por_categoria': {c: dict(f) for c, f in self.por_categoria.items()},
+            'mas_dificiles': self.mas_dificiles()
+        }
+
+def _tablero(archivo: str) -> Tablero:
+    tablero = _tableros.get(archivo)
+    if tablero is None:
+        tablero = _tableros[archivo] = Tablero(archivo)
+    return tablero
+
+def leer_tablero(archivo: str) -> Dict:
+    """
+    Resumen del tablero para el panel. Solo se lee de disco lo que cambió desde la última
+    vez, así mostrar el panel no depende de cuántos intentos hay.
+    """
+    with _lock:
+        tablero = _tablero(archivo)
+        tablero.sincronizar()
+        return tablero.resumen()
+
+def registrar_en_tablero(archivo: str, stats: Dict, respuestas: List[Dict], modo: str,
+                         usuario: Optional[str] = None):
+    """Suma un intento al tablero: agrega una línea al diario y actualiza la copia en memoria"""
+    intento = resumir_intento(stats, respuestas, modo, usuario)
+    with _lock:
+        _tablero(archivo).registrar(intento)
@@ -1,9 +1,33 @@
 # config.py - Configuración de la aplicación
 
+import os
+
 # Configuración del examen
 TOTAL_PREGUNTAS_EXAMEN = 100
 PORCENTAJE_APROBACION = 80
 TIEMPO_EXAMEN_MINUTOS = 120  # 2 horas
+PREGUNTAS_POR_PAGINA = 10  # Modo examen paginado
+
+# Precarga en segundo plano de las próximas preguntas (por sesión)
+PRECARGA_MAX_PREGUNTAS = 3
+PRECARGA_MAX_BYTES = 8 * 1024 * 1024
+
+# Configuración del modo adaptativo
+PREGUNTAS_MIN_ADAPTATIVO = 15
+PREGUNTAS_MAX_ADAPTATIVO = 50
+ERROR_OBJETIVO_ADAPTATIVO = 0.35  # Error estándar de la habilidad (logits) para dar la estimación por estable
+
+# Preguntas similares que se ofrece sumar a la práctica tras una respuesta incorrecta
+PREGUNTAS_SIMILARES = 3
+
+# Control de carga: inicios de simulacro simultáneos y datos por sesión
+MAX_INICIOS_CONCURRENTES = 4  # Los demás esperan en cola por orden de llegada
+ESPERA_MAXIMA_INICIO_SEGUNDOS = 30
+MAX_PREGUNTAS_SESION = 200  # Incluye las similares agregadas durante la práctica
+SESION_INACTIVA_MINUTOS = 30  # Después se liberan la precarga y demás datos pesados de la sesión
+
+# Clave del panel del instructor (variable de entorno QUIZ_CLAVE_INSTRUCTOR). Sin clave, el panel no se muestra
+CLAVE_INSTRUCTOR = os.environ.get("QUIZ_CLAVE_INSTRUCTOR", "")
 
 # Categorías de preguntas (basado en el syllabus de ANAC)
 CATEGORIAS = {
@@ -18,6 +42,25 @@ CATEGORIAS = {
     "general": "📚 Conocimientos Generales"
 }
 
+# Bancos de preguntas (uno por escuela de vuelo). Cada banco puede definir:
+#   archivo:     JSON con las preguntas
+#   nombre:      nombre visible
+#   imagenes:    directorio base de sus figuras (opcional, por defecto las rutas del JSON)
+#   categorias:  categorías propias (opcional, por defecto CATEGORIAS)
+#   similares:   tabla de preguntas similares (opcional, por defecto <archivo>_similares.npz)
+# El banco se elige por despliegue (variable de entorno QUIZ_BANCO) y, solo si se habilita
+# PERMITIR_BANCO_POR_URL, también por URL (?banco=...)
+BANCOS = {
+    "anac": {
+        "archivo": "datos_quiz.json",
+        "nombre": "ANAC - Piloto Privado de Avión"
+    }
+}
+BANCO_POR_DEFECTO = "anac"
+PERMITIR_BANCO_POR_URL = False  # Cualquiera que tenga el enlace podría cambiar de banco
+MAX_BANCOS_EN_MEMORIA = 8
+INTERVALO_RECARGA_SEGUNDOS = 2  # Cada cuánto se revisa si cambió el archivo de un banco
+
 # Colores del tema
 COLORS = {
     "primary": "#1E3A8A",      # Azul oscuro
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Corrección masiva de hojas de respuesta
+Compara un CSV de (alumno, formulario, respuestas) contra las claves generadas por
+generar_formularios.py y calcula puntaje y desglose por categoría de cada hoja
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+import numpy as np
+
+from bancos import BANCOS, obtener_banco, banco_de_entorno
+from utils import armar_estadisticas, registrar_intento
+
+LETRAS = "abcdefghij"
+SIN_RESPUESTA = -1
+# Cualquier número mayor no puede tener clave (y no entra en las matrices)
+MAX_FORMULARIO = 2**31 - 1
+
+def cargar_claves(archivo_claves, categorias_banco):
+    """
+    Carga claves.jsonl en matrices indexadas por número de formulario:
+    respuestas correctas, código de categoría e id de pregunta de cada posición
+    """
+    with open(archivo_claves, 'r', encoding='utf-8') as f:
+        claves = [json.loads(linea) for linea in f if linea.strip()]
+
+    categorias = list(categorias_banco.keys())
+    for clave in claves:
+        for cat in clave['categorias']:
+            if cat not in categorias:
+                categorias.append(cat)
+    codigos = {cat: i for i, cat in enumerate(categorias)}
+
+    max_formulario = max(c['formulario'] for c in claves)
+    largo = max(len(c['respuestas']) for c in claves)
+
+    # -2 nunca coincide con una respuesta; -1 marca posiciones sin pregunta
+    matriz_clave = np.full((max_formulario + 1, largo), -2, dtype=np.int8)
+    matriz_categoria = np.full((max_formulario + 1, largo), -1, dtype=np.int16)
+    matriz_ids = np.full((max_formulario + 1, largo), -1, dtype=np.int64)
+    for clave in claves:
+        n = len(clave['respuestas'])
+        matriz_clave[clave['formulario'], :n] = clave['respuestas']
+        matriz_categoria[clave['formulario'], :n] = [codigos[c] for c in clave['categorias']]
+        matriz_ids[clave['formulario'], :n] = clave['preguntas']
+
+    return matriz_clave, matriz_categoria, matriz_ids, categorias
+
+def parsear_respuestas(texto, largo):
+    """
+    Convierte una hoja ("abca-c..." o "0,1,2,,0") en índices de opción.
+    Las posiciones en blanco, '-', '?' o con un número de opción imposible quedan sin respuesta.
+    """
+    texto = texto.strip().lower()
+    if "," in texto or ";" in texto:
+        partes = texto.replace(";", ",").split(",")
+    else:
+        partes = list(texto.replace(" ", ""))
+
+    fila = np.full(largo, SIN_RESPUESTA, dtype=np.int8)
+    for i, parte in enumerate(partes[:largo]):
+        parte = parte.strip()
+        if parte.isdecimal():
+            if int(parte) < len(LETRAS):
+                fila[i] = int(parte)
+        elif len(parte) == 1 and parte in LETRAS:
+            fila[i] = LETRAS.index(parte)
+    return fila
+
+def leer_formulario(texto):
+    """
+    Número de formulario escrito en la hoja. Devuelve (valor para el resultado, número
+    para indexar las claves); un valor que no es un número queda como formulario -1,
+    que nunca tiene clave.
+    """
+    texto = (texto or "").strip()
+    try:
+        numero = int(texto)
+    except ValueError:
+        return texto, -1
+    return numero, numero if 0 <= numero <= MAX_FORMULARIO else -1
+
+def leer_hojas(archivo_csv, largo):
+    """
+    Lee el CSV de hojas y devuelve alumnos, formularios (para indexar las claves),
+    la matriz de respuestas y el formulario tal como vino en cada hoja
+    """
+    alumnos = []
+    escritos = []
+    formularios = []
+    filas = []
+    with open(archivo_csv, 'r', encoding='utf-8', newline='') as f:
+        for registro in csv.DictReader(f):
+            escrito, formulario = leer_formulario(registro['formulario'])
+            alumnos.append(registro['alumno'])
+            escritos.append(escrito)
+            formularios.append(formulario)
+            filas.append(parsear_respuestas(registro['respuestas'] or "", largo))
+
+    if not filas:
+        return alumnos, np.zeros(0, dtype=np.int64), np.zeros((0, largo), dtype=np.int8), escritos
+    return alumnos, np.array(formularios, dtype=np.int64), np.vstack(filas), escritos
+
+def corregir(formularios, respuestas, matriz_clave, matriz_categoria, categorias):
+    """
+    Corrige todas las hojas en una sola pasada vectorizada.
+    Devuelve una lista con el mismo formato que calcular_estadisticas por cada hoja.
+    """
+    claves = matriz_clave[formularios]
+    cats = matriz_categoria[formularios]
+    validas = cats >= 0
+    aciertos = (respuestas == claves) & validas
+
+    n_hojas = len(formularios)
+    n_cats = len(categorias)
+    totales = validas.sum(axis=1)
+    correctas = aciertos.sum(axis=1)
+
+    # Conteo por (hoja, categoría) con un único bincount sobre índices aplanados
+    indices = (np.arange(n_hojas)[:, None] * n_cats + cats)[validas]
+    total_cat = np.bincount(indices, minlength=n_hojas * n_cats).reshape(n_hojas, n_cats)
+    correctas_cat = np.bincount(
+        indices, weights=aciertos[validas], minlength=n_hojas * n_cats
+    ).reshape(n_hojas, n_cats).astype(np.int64)
+
+    resultados = []
+    for i in range(n_hojas):
+        if totales[i] == 0:
+            resultados.append({})
+            continue
+        stats_categoria = {
+            categorias[c]: {'total': int(total_cat[i, c]), 'correctas': int(correctas_cat[i, c])}
+            for c in np.flatnonzero(total_cat[i])
+        }
+        resultados.append(armar_estadisticas(int(totales[i]), int(correctas[i]), stats_categoria))
+    return resultados
+
+def corregir_hojas(archivo_hojas, archivo_claves, archivo_salida, categorias_banco, archivo_intentos=None):
+    """
+    Corrige el CSV de hojas y guarda un resultado por línea en archivo_salida.
+    Si se indica archivo_intentos, agrega cada hoja al registro para el análisis de ítems.
+    """
+    matriz_clave, matriz_categoria, matriz_ids, categorias = cargar_claves(archivo_claves, categorias_banco)
+    alumnos, formularios, respuestas, escritos = leer_hojas(archivo_hojas, matriz_clave.shape[1])
+
+    # Sin clave: no es un número, está fuera de rango o no aparece en claves.jsonl
+    en_rango = (formularios >= 0) & (formularios < len(matriz_clave))
+    con_clave = (matriz_categoria >= 0).any(axis=1)
+    desconocidos = ~en_rango | ~con_clave[np.where(en_rango, formularios, 0)]
+    for i in np.flatnonzero(desconocidos):
+        print(f"⚠️  {alumnos[i]}: formulario {escritos[i]!r} sin clave, se omite")
+    # Solo para indexar las matrices: el formulario 0 nunca tiene clave y da estadísticas vacías.
+    # En el resultado se guarda el formulario tal como vino en la hoja
+    filas = np.where(desconocidos, 0, formularios)
+
+    resultados = corregir(filas, respuestas, matriz_clave, matriz_categoria, categorias)
+
+    with open(archivo_salida, 'w', encoding='utf-8') as f:
+        for alumno, formulario, desconocido, stats in zip(alumnos, escritos, desconocidos, resultados):
+            resultado = {
+                'alumno': alumno,
+                'formulario': formulario,
+                'estadisticas': stats
+            }
+            if desconocido:
+                resultado['formulario_desconocido'] = True
+            f.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+
+    if archivo_intentos:
+        ids = matriz_ids[filas]
+        for i in np.flatnonzero(~desconocidos):
+            validas = ids[i] >= 0
+            registrar_intento([
+                {'id': int(id_pregunta), 'indice_usuario': int(opcion)}
+                for id_pregunta, opcion in zip(ids[i][validas], respuestas[i][validas])
+            ], archivo_intentos, origen="papel")
+
+    return alumnos, resultados
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Corrige hojas de respuesta contra las claves de los formularios")
+    parser.add_argument("hojas", help="CSV con columnas alumno, formulario, respuestas")
+    parser.add_argument("--claves", default="formularios/claves.jsonl", help="Claves generadas por generar_formularios.py")
+    parser.add_argument("--salida", default="resultados.jsonl", help="Archivo de resultados (una línea por hoja)")
+    parser.add_argument("--banco", default=banco_de_entorno(), choices=list(BANCOS),
+                        help="Banco de los formularios (por defecto, el del despliegue)")
+    parser.add_argument("--registrar", metavar="INTENTOS", nargs="?", const="", default=None,
+                        help="Agregar las hojas al registro de intentos (por defecto, el del banco)")
+    args = parser.parse_args()
+
+    banco = obtener_banco(args.banco)
+    if args.registrar == "":
+        args.registrar = banco.archivo_intentos
+
+    print("=" * 60)
+    print("📝 CORRECCIÓN DE HOJAS DE RESPUESTA")
+    print("=" * 60)
+
+    try:
+        alumnos, resultados = corregir_hojas(args.hojas, args.claves, args.salida, banco.categorias, args.registrar)
+    except FileNotFoundError as e:
+        print(f"❌ Error: No se encontró el archivo {e.filename}")
+        sys.exit(1)
+
+    corregidas = [r for r in resultados if r]
+    aprobados = sum(1 for r in corregidas if r['aprobado'])
+    print(f"✅ Corregidas {len(corregidas)}/{len(alumnos)} hojas")
+    if corregidas:
+        promedio = sum(r['porcentaje'] for r in corregidas) / len(corregidas)
+        print(f"  Aprobados: {aprobados} ({aprobados / len(corregidas) * 100:.1f}%)")
+        print(f"  Promedio:  {promedio:.1f}%")
+    print(f"\n💾 Resultados guardados en: {args.salida}")
@@ -0,0 +1,355 @@
+// app.js - Simulador PPA que corre completo en el navegador
+// Los datos (banco, categorías, reglas de aprobación) los genera exportar_estatico.py en datos.js
+(function () {
+    "use strict";
+
+    var BANCO = window.BANCO;
+    var CONFIG = BANCO.config;
+    var CATEGORIAS = {};
+    BANCO.categorias.forEach(function (par) { CATEGORIAS[par[0]] = par[1]; });
+
+    // Cada pregunta compacta es [id, texto, opciones, correcta, categoría, imagen, explicación]
+    var PREGUNTAS = BANCO.preguntas.map(function (p) {
+        return {
+            id: p[0],
+            pregunta: p[1],
+            opciones: p[2],
+            correcta: p[3],
+            categoria: BANCO.categorias[p[4]][0],
+            imagen: p[5] >= 0 ? BANCO.imagenes[p[5]] : null,
+            explicacion: p[6]
+        };
+    });
+
+    var estado = {
+        modo: "examen",
+        preguntas: [],
+        indice: 0,
+        respuestas: [],
+        respondido: false,
+        tiempoInicio: null,
+        conTimer: false,
+        intervalo: null
+    };
+
+    var raiz = document.getElementById("app");
+
+    Object.keys(BANCO.colores).forEach(function (nombre) {
+        document.documentElement.style.setProperty("--" + nombre, BANCO.colores[nombre]);
+    });
+
+    // ==========================================
+    // UTILIDADES
+    // ==========================================
+    function el(etiqueta, atributos) {
+        var nodo = document.createElement(etiqueta);
+        Object.keys(atributos || {}).forEach(function (clave) {
+            if (clave === "onclick") {
+                nodo.addEventListener("click", atributos[clave]);
+            } else {
+                nodo.setAttribute(clave, atributos[clave]);
+            }
+        });
+        for (var i = 2; i < arguments.length; i++) {
+            var hijo = arguments[i];
+            if (hijo === null || hijo === undefined) continue;
+            nodo.appendChild(typeof hijo === "string" ? document.createTextNode(hijo) : hijo);
+        }
+        return nodo;
+    }
+
+    function mostrar() {
+        raiz.innerHTML = "";
+        for (var i = 0; i < arguments.length; i++) {
+            if (arguments[i]) raiz.appendChild(arguments[i]);
+        }
+        window.scrollTo(0, 0);
+    }
+
+    function seleccionarPreguntas(cantidad, categoria) {
+        var filtradas = PREGUNTAS.filter(function (p) {
+            return categoria === "todas" || p.categoria === categoria;
+        });
+        // Fisher-Yates parcial: las primeras 'cantidad' quedan al azar
+        var n = Math.min(cantidad, filtradas.length);
+        for (var i = 0; i < n; i++) {
+            var j = i + Math.floor(Math.random() * (filtradas.length - i));
+            var tmp = filtradas[i];
+            filtradas[i] = filtradas[j];
+            filtradas[j] = tmp;
+        }
+        return filtradas.slice(0, n);
+    }
+
+    // Misma estructura y reglas que calcular_estadisticas en utils.py
+    function calcularEstadisticas(respuestas) {
+        var total = respuestas.length;
+        if (total === 0) return {};
+
+        var correctas = 0;
+        var porCategoria = {};
+        respuestas.forEach(function (r) {
+            if (r.correcta) correctas++;
+            var cat = r.categoria || "general";
+            if (!porCategoria[cat]) porCategoria[cat] = { total: 0, correctas: 0 };
+            porCategoria[cat].total++;
+            if (r.correcta) porCategoria[cat].correctas++;
+        });
+        Object.keys(porCategoria).forEach(function (cat) {
+            porCategoria[cat].porcentaje = porCategoria[cat].correctas / porCategoria[cat].total * 100;
+        });
+
+        var porcentaje = correctas / total * 100;
+        return {
+            total: total,
+            correctas: correctas,
+            incorrectas: total - correctas,
+            porcentaje: porcentaje,
+            aprobado: porcentaje >= CONFIG.aprobacion,
+            por_categoria: porCategoria
+        };
+    }
+
+    function formatearTiempo(segundos) {
+        var h = Math.floor(segundos / 3600);
+        var m = Math.floor((segundos % 3600) / 60);
+        var s = segundos % 60;
+        var dos = function (x) { return (x < 10 ? "0" : "") + x; };
+        return h > 0 ? dos(h) + ":" + dos(m) + ":" + dos(s) : dos(m) + ":" + dos(s);
+    }
+
+    function detenerTimer() {
+        if (estado.intervalo) clearInterval(estado.intervalo);
+        estado.intervalo = null;
+    }
+
+    // ==========================================
+    // PÁGINAS
+    // ==========================================
+    function mostrarHome() {
+        detenerTimer();
+        var tarjeta = function (titulo, items, boton, modo) {
+            return el("div", { "class": "stat-card" },
+                el("h3", {}, titulo),
+                el.apply(null, ["ul", {}].concat(items.map(function (t) { return el("li", {}, t); }))),
+                el("button", { onclick: function () { mostrarConfigurar(modo); } }, boton));
+        };
+        mostrar(
+            el("h1", {}, BANCO.textos.titulo_app),
+            el("p", {}, BANCO.textos.subtitulo),
+            el("div", { "class": "tarjetas" },
+                tarjeta("🎯 Modo Examen", [CONFIG.total_examen + " preguntas aleatorias", "Sin feedback inmediato",
+                                          "Tiempo limitado (opcional)", "Resultados al final"], "🚀 Comenzar Examen", "examen"),
+                tarjeta("📚 Modo Práctica", ["Elige cantidad de preguntas", "Filtra por categoría",
+                                            "Feedback inmediato", "Explicaciones detalladas"], "📖 Modo Práctica", "practica")),
+            el("p", {}, PREGUNTAS.length + " preguntas · " + BANCO.categorias.length +
+               " categorías · aprobación " + CONFIG.aprobacion + "%"));
+    }
+
+    function mostrarConfigurar(modo) {
+        estado.modo = modo;
+        var controles;
+        if (modo === "examen") {
+            var timer = el("input", { type: "checkbox", id: "timer" });
+            controles = el("div", {},
+                el("div", { "class": "mensaje info" }, "🎯 Modo Examen: simula las condiciones reales del examen de ANAC"),
+                el("label", {}, timer, " ⏱️ Activar timer de " + CONFIG.tiempo_minutos + " minutos"));
+        } else {
+            var cantidad = el("select", { id: "cantidad" });
+            for (var c = 10; c <= 100; c += 10) {
+                var opcion = el("option", { value: c }, String(c));
+                if (c === 50) opcion.selected = true;
+                cantidad.appendChild(opcion);
+            }
+            var categoria = el("select", { id: "categoria" }, el("option", { value: "todas" }, "📋 Todas las categorías"));
+            BANCO.categorias.forEach(function (par) {
+                categoria.appendChild(el("option", { value: par[0] }, par[1]));
+            });
+            controles = el("div", {},
+                el("div", { "class": "mensaje info" }, "📚 Modo Práctica: personaliza tu sesión de estudio"),
+                el("label", { "class": "campo", "for": "cantidad" }, "Cantidad de preguntas"), cantidad,
+                el("label", { "class": "campo", "for": "categoria" }, "Categoría"), categoria);
+        }
+
+        mostrar(
+            el("h1", {}, "⚙️ Configurar Simulacro"),
+            controles,
+            el("p", {},
+                el("button", { "class": "secundario", onclick: mostrarHome }, "◀️ Volver"),
+                el("button", { onclick: comenzar }, "▶️ Comenzar")));
+    }
+
+    function comenzar() {
+        if (estado.modo === "examen") {
+            estado.conTimer = document.getElementById("timer").checked;
+            estado.preguntas = seleccionarPreguntas(CONFIG.total_examen, "todas");
+        } else {
+            estado.conTimer = false;
+            estado.preguntas = seleccionarPreguntas(
+                parseInt(document.getElementById("cantidad").value, 10),
+                document.getElementById("categoria").value);
+        }
+        if (!estado.preguntas.length) {
+            alert("❌ No hay preguntas para esa configuración");
+            return;
+        }
+        estado.indice = 0;
+        estado.respuestas = [];
+        estado.respondido = false;
+        estado.tiempoInicio = Date.now();
+
+        detenerTimer();
+        if (estado.conTimer) {
+            estado.intervalo = setInterval(actualizarTimer, 1000);
+        }
+        mostrarPregunta();
+    }
+
+    function actualizarTimer() {
+        var nodo = document.getElementById("timer-box");
+        var restante = Math.max(0, CONFIG.tiempo_minutos * 60 - Math.floor((Date.now() - estado.tiempoInicio) / 1000));
+        if (nodo) nodo.textContent = "⏱️ " + formatearTiempo(restante);
+        if (restante === 0) {
+            detenerTimer();
+            alert("⏰ ¡Tiempo agotado!");
+            mostrarResultados();
+        }
+    }
+
+    function registrar(pregunta, indiceElegido) {
+        var respuesta = {
+            id: pregunta.id,
+            pregunta: pregunta.pregunta,
+            respuesta_usuario: pregunta.opciones[indiceElegido],
+            indice_usuario: indiceElegido,
+            respuesta_correcta: pregunta.opciones[pregunta.correcta],
+            correcta: indiceElegido === pregunta.correcta,
+            categoria: pregunta.categoria,
+            explicacion: pregunta.explicacion
+        };
+        estado.respuestas.push(respuesta);
+        return respuesta;
+    }
+
+    function avanzar() {
+        if (estado.indice >= estado.preguntas.length - 1) {
+            mostrarResultados();
+        } else {
+            estado.indice++;
+            mostrarPregunta();
+        }
+    }
+
+    function mostrarPregunta() {
+        var pregunta = estado.preguntas[estado.indice];
+        var total = estado.preguntas.length;
+        var nombre = "opcion-" + estado.indice;
+
+        var opciones = el("form", {});
+        opciones.addEventListener("submit", function (e) { e.preventDefault(); });
+        pregunta.opciones.forEach(function (texto, i) {
+            var radio = el("input", { type: "radio", name: nombre, value: i });
+            if (i === 0) radio.checked = true;
+            opciones.appendChild(el("label", { "class": "opcion" }, radio, " " + texto));
+        });
+
+        var feedback = el("div", {});
+        var boton = el("button", {}, estado.modo === "examen" ? "➡️ Siguiente Pregunta" : "✅ Enviar Respuesta");
+        boton.addEventListener("click", function () {
+            if (estado.modo === "examen") {
+                registrar(pregunta, parseInt(opciones.querySelector("input:checked").value, 10));
+                avanzar();
+                return;
+            }
+            if (estado.respondido) {
+                estado.respondido = false;
+                avanzar();
+                return;
+            }
+            // Práctica: corregir en el momento, sin ir al servidor
+            var respuesta = registrar(pregunta, parseInt(opciones.querySelector("input:checked").value, 10));
+            estado.respondido = true;
+            var etiquetas = opciones.querySelectorAll("label");
+            opciones.querySelectorAll("input").forEach(function (r) { r.disabled = true; });
+            etiquetas[pregunta.correcta].classList.add("correcta");
+            if (!respuesta.correcta) etiquetas[respuesta.indice_usuario].classList.add("incorrecta");
+            feedback.appendChild(respuesta.correcta
+                ? el("div", { "class": "mensaje exito" }, "✅ ¡Correcto!")
+                : el("div", { "class": "mensaje error" }, "❌ Incorrecto. La respuesta correcta es: " + respuesta.respuesta_correcta));
+            if (pregunta.explicacion) {
+                feedback.appendChild(el("div", { "class": "mensaje info" }, "📖 " + pregunta.explicacion));
+            }
+            boton.textContent = "➡️ Siguiente Pregunta";
+        });
+
+        var progreso = el("div", { "class": "barra" }, el("div", { style: "width:" + (estado.indice + 1) / total * 100 + "%" }));
+
+        mostrar(
+            el("h1", {}, estado.modo === "examen" ? "🎯 Examen Simulado" : "📚 Modo Práctica"),
+            estado.conTimer ? el("div", { "class": "timer-box", id: "timer-box" }, "⏱️ --:--") : null,
+            progreso,
+            el("div", { "class": "categoria-badge" }, CATEGORIAS[pregunta.categoria] || pregunta.categoria),
+            el("div", { "class": "pregunta-box" },
+                el("h3", {}, "Pregunta " + (estado.indice + 1) + " de " + total),
+                el("p", { style: "font-size: 1.1rem;" }, pregunta.pregunta),
+                pregunta.imagen ? el("img", { src: pregunta.imagen, alt: "Referencia de la pregunta" }) : null),
+            el("h3", {}, "Selecciona tu respuesta:"),
+            opciones,
+            feedback,
+            el("p", {}, boton,
+                el("button", { "class": "secundario", onclick: function () {
+                    if (estado.respuestas.length) { mostrarResultados(); } else { mostrarHome(); }
+                } }, "🚪 Abandonar Simulacro")));
+        if (estado.conTimer) actualizarTimer();
+    }
+
+    function mostrarResultados() {
+        detenerTimer();
+        var stats = calcularEstadisticas(estado.respuestas);
+        if (!stats.total) {
+            mostrarHome();
+            return;
+        }
+
+        var categorias = el("div", {});
+        Object.keys(stats.por_categoria).forEach(function (cat) {
+            var data = stats.por_categoria[cat];
+            var color = data.porcentaje >= 80 ? "🟢" : data.porcentaje >= 60 ? "🟡" : "🔴";
+            categorias.appendChild(el("div", {},
+                el("p", {}, el("strong", {}, CATEGORIAS[cat] || cat),
+                   " " + color + " " + data.correctas + "/" + data.total + " (" + data.porcentaje.toFixed(0) + "%)"),
+                el("div", { "class": "barra" }, el("div", { style: "width:" + data.porcentaje + "%" }))));
+        });
+
+        var incorrectas = el("div", {});
+        estado.respuestas.forEach(function (r, i) {
+            if (r.correcta) return;
+            incorrectas.appendChild(el("div", {},
+                el("p", {}, el("strong", {}, (i + 1) + ". " + r.pregunta)),
+                el("ul", {},
+                    el("li", {}, "Tu respuesta: ❌ " + r.respuesta_usuario),
+                    el("li", {}, "Respuesta correcta: ✅ " + r.respuesta_correcta)),
+                r.explicacion ? el("div", { "class": "mensaje info" }, "📖 " + r.explicacion) : null,
+                el("hr", {})));
+        });
+
+        mostrar(
+            el("div", { "class": "mensaje " + (stats.aprobado ? "exito" : "error") },
+                el("h2", {}, stats.aprobado ? BANCO.textos.aprobado : BANCO.textos.desaprobado),
+                el("strong", {}, stats.aprobado ? BANCO.textos.msg_aprobado : BANCO.textos.msg_desaprobado)),
+            el("div", { "class": "metricas" },
+                el("div", {}, "Total Preguntas", el("strong", {}, String(stats.total))),
+                el("div", {}, "Correctas", el("strong", {}, String(stats.correctas))),
+                el("div", {}, "Incorrectas", el("strong", {}, String(stats.incorrectas))),
+                el("div", {}, "Porcentaje", el("strong", {}, stats.porcentaje.toFixed(1) + "%"))),
+            el("h2", {}, "📊 Resultados por Categoría"),
+            categorias,
+            stats.incorrectas ? el("details", {},
+                el("summary", {}, "❌ Ver " + stats.incorrectas + " pregunta(s) incorrecta(s)"), incorrectas) : null,
+            el("p", {},
+                el("button", { onclick: function () { mostrarConfigurar(estado.modo); } }, "🔄 Nuevo Simulacro"),
+                el("button", { "class": "secundario", onclick: mostrarHome }, "🏠 Volver al Inicio")));
+    }
+
+    mostrarHome();
+})();
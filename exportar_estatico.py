@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Exportación estática del simulador
+Compila el banco de preguntas, las categorías, las figuras y las reglas de aprobación
+en un paquete HTML/JS que corre exámenes y práctica completamente en el navegador
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+
+from config import COLORS, TEXTOS, TOTAL_PREGUNTAS_EXAMEN, PORCENTAJE_APROBACION, TIEMPO_EXAMEN_MINUTOS
+from bancos import BANCOS, obtener_banco, banco_de_entorno
+from figuras import optimizar_figuras
+
+DIRECTORIO_PLANTILLA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "estatico")
+
+def compilar_banco(preguntas, categorias_banco):
+    """
+    Arma la estructura compacta que lee app.js: cada pregunta es una lista
+    [id, texto, opciones, correcta, índice de categoría, índice de imagen (-1 si no tiene), explicación]
+    """
+    categorias = list(categorias_banco.keys())
+    imagenes = []
+    indice_imagen = {}
+    compactas = []
+
+    for p in preguntas:
+        imagen = p.get('imagen')
+        if imagen:
+            if imagen not in indice_imagen:
+                indice_imagen[imagen] = len(imagenes)
+                imagenes.append(imagen)
+            i_imagen = indice_imagen[imagen]
+        else:
+            i_imagen = -1
+        compactas.append([
+            p['id'],
+            p['pregunta'],
+            p['opciones'],
+            p['correcta'],
+            categorias.index(p.get('categoria', 'general')),
+            i_imagen,
+            p.get('explicacion', '')
+        ])
+
+    return {
+        'config': {
+            'total_examen': TOTAL_PREGUNTAS_EXAMEN,
+            'aprobacion': PORCENTAJE_APROBACION,
+            'tiempo_minutos': TIEMPO_EXAMEN_MINUTOS
+        },
+        'categorias': [[k, categorias_banco[k]] for k in categorias],
+        'colores': COLORS,
+        'textos': {k: v for k, v in TEXTOS.items() if k != 'descripcion_home'},
+        'imagenes': imagenes,
+        'preguntas': compactas
+    }
+
+def exportar(banco_id, salida):
+    """Genera el paquete estático de un banco en el directorio de salida"""
+    origen = obtener_banco(banco_id)
+    if not origen.preguntas:
+        return None
+
+    banco = compilar_banco(origen.preguntas, origen.categorias)
+    os.makedirs(salida, exist_ok=True)
+
+    # Se publican las figuras recomprimidas (las mismas que usan los formularios), con un
+    # nombre propio en el paquete: el original puede estar fuera del directorio o ser PNG
+    optimizadas = optimizar_figuras(banco['imagenes'])
+    publicadas = []
+    for i, imagen in enumerate(banco['imagenes']):
+        archivo = optimizadas[imagen]
+        nombre = os.path.splitext(os.path.basename(imagen))[0] + os.path.splitext(archivo)[1].lower()
+        publicadas.append((archivo, f"figuras/{i:03d}_{nombre}"))
+    banco['imagenes'] = [destino for _, destino in publicadas]
+
+    # Los datos van como script (no JSON) para que el paquete también funcione abierto con file://
+    with open(os.path.join(salida, "datos.js"), 'w', encoding='utf-8') as f:
+        f.write("window.BANCO = ")
+        json.dump(banco, f, ensure_ascii=False, separators=(',', ':'))
+        f.write(";\n")
+
+    for nombre in ("index.html", "app.js", "estilos.css"):
+        shutil.copyfile(os.path.join(DIRECTORIO_PLANTILLA, nombre), os.path.join(salida, nombre))
+
+    # Solo se copian las figuras que usa el banco (la validación ya garantizó que existen)
+    os.makedirs(os.path.join(salida, "figuras"), exist_ok=True)
+    for archivo, destino in publicadas:
+        shutil.copyfile(archivo, os.path.join(salida, destino))
+
+    return banco
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta el simulador como sitio estático")
+    parser.add_argument("--banco", default=banco_de_entorno(), choices=list(BANCOS),
+                        help="Banco de preguntas (por defecto, el del despliegue)")
+    parser.add_argument("--salida", default="dist", help="Directorio de salida")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📦 EXPORTACIÓN ESTÁTICA DEL SIMULADOR")
+    print("=" * 60)
+
+    banco = exportar(args.banco, args.salida)
+    if banco is None:
+        print("❌ No se pudieron cargar las preguntas")
+        sys.exit(1)
+
+    tamano = os.path.getsize(os.path.join(args.salida, "datos.js"))
+    tamano_figuras = sum(os.path.getsize(os.path.join(args.salida, imagen)) for imagen in banco['imagenes'])
+    print(f"✅ {len(banco['preguntas'])} preguntas, {len(banco['imagenes'])} figuras")
+    print(f"  datos.js: {tamano / 1024:.1f} KB")
+    print(f"  figuras:  {tamano_figuras / 1024:.1f} KB")
+    print(f"\n✨ Sitio generado en: {args.salida}")
+    print(f"🌐 Abre {os.path.join(args.salida, 'index.html')} o sírvelo con cualquier servidor estático")
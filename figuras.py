@@ -0,0 +1,57 @@
+# figuras.py - Figuras del banco recomprimidas una sola vez para los paquetes exportados
+
+import hashlib
+import io
+import os
+from typing import Dict, Iterable
+
+DIRECTORIO_FIGURAS = os.path.join(".cache", "figuras")
+# Las figuras se imprimen a 12 cm como máximo: más resolución solo suma bytes
+LADO_MAXIMO = 1000
+CALIDAD_JPEG = 85
+
+def _recomprimir(datos: bytes) -> bytes:
+    """JPEG sobre fondo blanco y con el lado mayor acotado (las figuras escaneadas comprimen mal en PNG)"""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(datos)) as imagen:
+        imagen = imagen.convert('RGBA')
+        fondo = Image.new('RGB', imagen.size, 'white')
+        fondo.paste(imagen, mask=imagen.getchannel('A'))
+    fondo.thumbnail((LADO_MAXIMO, LADO_MAXIMO))
+    salida = io.BytesIO()
+    fondo.save(salida, 'JPEG', quality=CALIDAD_JPEG, optimize=True)
+    return salida.getvalue()
+
+def figura_optimizada(ruta: str, directorio: str = DIRECTORIO_FIGURAS) -> str:
+    """
+    Ruta de la versión recomprimida de una figura. Se genera la primera vez, indexada por
+    el hash del contenido, y se reutiliza mientras la figura no cambie. Si no se puede
+    recomprimir (o no achica) se devuelve la original.
+    """
+    with open(ruta, 'rb') as f:
+        datos = f.read()
+    destino = os.path.join(directorio, hashlib.sha256(datos).hexdigest()[:24] + ".jpg")
+    if os.path.exists(destino):
+        return destino
+
+    try:
+        optimizada = _recomprimir(datos)
+    except (ImportError, OSError, ValueError):
+        return ruta
+    if len(optimizada) >= len(datos):
+        return ruta
+
+    try:
+        os.makedirs(directorio, exist_ok=True)
+        temporal = f"{destino}.{os.getpid()}.tmp"
+        with open(temporal, 'wb') as f:
+            f.write(optimizada)
+        os.replace(temporal, destino)
+    except OSError:
+        return ruta
+    return destino
+
+def optimizar_figuras(rutas: Iterable[str], directorio: str = DIRECTORIO_FIGURAS) -> Dict[str, str]:
+    """Versión optimizada de cada figura (ver figura_optimizada), una vez por figura distinta"""
+    return {ruta: figura_optimizada(ruta, directorio) for ruta in dict.fromkeys(rutas)}
@@ -0,0 +1,48 @@
+# fragmentos.py - Fragmentos HTML de cada pregunta, armados una vez por versión del banco
+
+from html import escape
+from typing import Dict
+
+def _texto_html(texto: str) -> str:
+    """Texto del banco listo para insertar en HTML (escapado, con saltos de línea)"""
+    return escape(texto).replace("\n", "<br>")
+
+def armar_fragmentos(pregunta: Dict, categorias: Dict) -> Dict:
+    """
+    Fragmentos HTML de una pregunta. Los textos se escapan acá, así mostrar una pregunta
+    es solo concatenar. Cada fragmento es HTML completo (abre y cierra sus etiquetas); los
+    recuadros y las partes que dependen de la sesión (número de pregunta, opción elegida)
+    se agregan al usarlos: ver caja_pregunta y entrada_revision.
+    """
+    categoria = pregunta.get('categoria', 'general')
+    badge = (f'<div class="categoria-badge">{escape(categorias[categoria])}</div>'
+             if categoria in categorias else "")
+
+    explicacion = pregunta.get('explicacion', '')
+    explicacion_html = f'<div class="explicacion-box">📖 {_texto_html(explicacion)}</div>' if explicacion else ""
+
+    texto = _texto_html(pregunta["pregunta"])
+    opciones = [_texto_html(o) for o in pregunta['opciones']]
+    correcta = opciones[pregunta['correcta']]
+    # Una lista de respuestas por opción incorrecta posible
+    respuestas = [
+        f'<ul><li>Tu respuesta: ❌ {opcion}</li><li>Respuesta correcta: ✅ {correcta}</li></ul>'
+        for opcion in opciones
+    ]
+
+    return {
+        'badge': badge,
+        'texto': texto,
+        'enunciado': f'<p style="font-size: 1.1rem;">{texto}</p>',
+        'explicacion': explicacion_html,
+        'respuestas': respuestas
+    }
+
+def caja_pregunta(fragmentos: Dict, numero: int, total: int) -> str:
+    """Recuadro del enunciado con el número de pregunta de la sesión"""
+    return f'<div class="pregunta-box"><h3>Pregunta {numero} de {total}</h3>{fragmentos["enunciado"]}</div>'
+
+def entrada_revision(fragmentos: Dict, numero: int, indice_usuario: int) -> str:
+    """Pregunta incorrecta de los resultados, con la respuesta que eligió el alumno"""
+    return (f'<div class="revision-item"><p><strong>{numero}. {fragmentos["texto"]}</strong></p>'
+            f'{fragmentos["respuestas"][indice_usuario]}{fragmentos["explicacion"]}</div>')
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Generador masivo de formularios de examen
+Crea N formularios distintos de 100 preguntas (HTML imprimible y, opcionalmente, PDF)
+junto con sus claves de respuesta en formato legible por máquina
+"""
+
+import argparse
+import base64
+import html
+import json
+import mimetypes
+import os
+import random
+import sys
+from multiprocessing import Pool
+
+from config import TOTAL_PREGUNTAS_EXAMEN
+from bancos import BANCOS, obtener_banco, banco_de_entorno
+from figuras import optimizar_figuras
+from utils import seleccionar_preguntas
+
+LETRAS = "abcdefghij"
+
+# Estado de cada proceso de trabajo (se inicializa una vez por proceso)
+_banco = []
+_imagenes_cache = {}
+_opciones = {}
+
+def _inicializar_worker(banco_id, opciones):
+    """Carga el banco una sola vez por proceso de trabajo"""
+    global _banco, _opciones
+    _banco = obtener_banco(banco_id).preguntas
+    _opciones = opciones
+
+def _imagen_data_uri(ruta):
+    """
+    Devuelve la imagen como data URI (cacheada por proceso) para embeberla en el HTML.
+    Se embebe la versión recomprimida, preparada una sola vez antes de repartir el trabajo
+    """
+    if ruta not in _imagenes_cache:
+        archivo = _opciones['figuras'].get(ruta, ruta)
+        if not os.path.exists(archivo):
+            _imagenes_cache[ruta] = None
+        else:
+            mime = mimetypes.guess_type(archivo)[0] or "image/png"
+            with open(archivo, 'rb') as f:
+                datos = base64.b64encode(f.read()).decode('ascii')
+            _imagenes_cache[ruta] = f"data:{mime};base64,{datos}"
+    return _imagenes_cache[ruta]
+
+def _escribir_html(f, numero, preguntas):
+    """Escribe el formulario pregunta por pregunta directamente al archivo"""
+    f.write(f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>Simulacro PPA - Formulario {numero:04d}</title>
+<style>
+    body {{ font-family: Arial, sans-serif; font-size: 11pt; margin: 2cm; }}
+    h1 {{ font-size: 16pt; margin-bottom: 0; }}
+    .datos {{ margin: 0.5cm 0 1cm 0; }}
+    .pregunta {{ page-break-inside: avoid; margin-bottom: 0.6cm; }}
+    .pregunta img {{ max-width: 12cm; max-height: 8cm; display: block; margin: 0.3cm 0; }}
+    .opciones {{ list-style: none; padding-left: 0.5cm; margin: 0.2cm 0; }}
+    @media print {{ body {{ margin: 0; }} }}
+</style>
+</head>
+<body>
+<h1>✈️ Simulacro Examen PPA - ANAC</h1>
+<div class="datos">
+    <strong>Formulario:</strong> {numero:04d} &nbsp;&nbsp;
+    <strong>Alumno:</strong> ______________________________ &nbsp;&nbsp;
+    <strong>Fecha:</strong> ____/____/______
+</div>
+""")
+    for n, pregunta in enumerate(preguntas, 1):
+        f.write('<div class="pregunta">\n')
+        f.write(f"<p><strong>{n}.</strong> {html.escape(pregunta['pregunta'])}</p>\n")
+        if pregunta.get("imagen"):
+            uri = _imagen_data_uri(pregunta["imagen"])
+            if uri:
+                f.write(f'<img src="{uri}" alt="Figura de referencia">\n')
+        f.write('<ul class="opciones">\n')
+        for letra, opcion in zip(LETRAS, pregunta["opciones"]):
+            f.write(f"<li>{letra}) {html.escape(opcion)}</li>\n")
+        f.write("</ul>\n</div>\n")
+    f.write("</body>\n</html>\n")
+
+def generar_formulario(numero):
+    """
+    Genera un formulario y lo escribe en disco.
+    Devuelve solo la clave de respuestas para no acumular contenido en memoria.
+    """
+    # Semilla determinística por formulario: el mismo comando reproduce los mismos formularios
+    random.seed(f"{_opciones['semilla']}-{numero}")
+    preguntas = seleccionar_preguntas(_banco, _opciones['cantidad'], _opciones['categoria'])
+
+    ruta_html = os.path.join(_opciones['salida'], f"formulario_{numero:04d}.html")
+    with open(ruta_html, 'w', encoding='utf-8') as f:
+        _escribir_html(f, numero, preguntas)
+
+    if _opciones['pdf']:
+        from weasyprint import HTML
+        HTML(ruta_html).write_pdf(ruta_html[:-len(".html")] + ".pdf")
+
+    return {
+        'formulario': numero,
+        'preguntas': [p['id'] for p in preguntas],
+        'respuestas': [p['correcta'] for p in preguntas],
+        'categorias': [p.get('categoria', 'general') for p in preguntas]
+    }
+
+def generar_formularios(banco_id, cantidad_formularios, salida, cantidad=TOTAL_PREGUNTAS_EXAMEN,
+                        categoria="todas", semilla=0, procesos=None, pdf=False):
+    """Genera los formularios en paralelo y escribe las claves a medida que se completan"""
+    os.makedirs(salida, exist_ok=True)
+    # Cada figura se recomprime una vez acá (y queda cacheada en disco), no en cada formulario
+    figuras = optimizar_figuras(p['imagen'] for p in obtener_banco(banco_id).preguntas
+                                if p.get('imagen') and os.path.exists(p['imagen']))
+    opciones = {
+        'cantidad': cantidad,
+        'categoria': categoria,
+        'semilla': semilla,
+        'salida': salida,
+        'pdf': pdf,
+        'figuras': figuras
+    }
+
+    ruta_claves = os.path.join(salida, "claves.jsonl")
+    generados = 0
+    with open(ruta_claves, 'w', encoding='utf-8') as claves, \
+         Pool(procesos, initializer=_inicializar_worker, initargs=(banco_id, opciones)) as pool:
+        for clave in pool.imap_unordered(generar_formulario, range(1, cantidad_formularios + 1), chunksize=4):
+            claves.write(json.dumps(clave, ensure_ascii=False) + "\n")
+            generados += 1
+            if generados % 50 == 0:
+                print(f"  Generados {generados}/{cantidad_formularios} formularios...")
+
+    return generados
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera formularios de examen imprimibles y sus claves")
+    parser.add_argument("cantidad_formularios", type=int, help="Cantidad de formularios a generar")
+    parser.add_argument("--banco", default=banco_de_entorno(), choices=list(BANCOS),
+                        help="Banco de preguntas (por defecto, el del despliegue)")
+    parser.add_argument("--salida", default="formularios", help="Directorio de salida")
+    parser.add_argument("--preguntas", type=int, default=TOTAL_PREGUNTAS_EXAMEN,
+                        help="Preguntas por formulario")
+    parser.add_argument("--categoria", default="todas", help="Categoría del banco (por defecto, todas)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla base para reproducir los formularios")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos de trabajo (por defecto: CPUs)")
+    parser.add_argument("--pdf", action="store_true", help="Generar también PDF (requiere weasyprint)")
+    args = parser.parse_args()
+
+    banco = obtener_banco(args.banco)
+    if not banco.preguntas:
+        print(f"❌ Error: No se pudieron cargar las preguntas de {banco.archivo}")
+        sys.exit(1)
+    if args.categoria != "todas" and args.categoria not in banco.categorias:
+        parser.error(f"categoría desconocida en el banco {args.banco}: {args.categoria} "
+                     f"(opciones: {', '.join(banco.categorias)})")
+
+    if args.pdf:
+        try:
+            import weasyprint  # noqa: F401
+        except ImportError:
+            print("❌ Error: para generar PDF instala weasyprint (pip install weasyprint)")
+            sys.exit(1)
+
+    print("=" * 60)
+    print("🖨️  GENERACIÓN DE FORMULARIOS PPA")
+    print("=" * 60)
+    print(f"Banco:       {banco.nombre} ({banco.archivo})")
+    print(f"Formularios: {args.cantidad_formularios}")
+    print(f"Salida:      {args.salida}")
+    print("=" * 60 + "\n")
+
+    generados = generar_formularios(
+        args.banco,
+        args.cantidad_formularios,
+        args.salida,
+        cantidad=args.preguntas,
+        categoria=args.categoria,
+        semilla=args.semilla,
+        procesos=args.procesos,
+        pdf=args.pdf
+    )
+
+    print(f"\n✨ {generados} formularios generados en: {args.salida}")
+    print(f"🔑 Claves de respuesta: {os.path.join(args.salida, 'claves.jsonl')}")
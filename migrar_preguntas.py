@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 """
 Script de migración de preguntas
-Agrega categorías automáticas y campo de explicación a las preguntas existentes
+Agrega ids estables, categorías automáticas y campo de explicación a las preguntas existentes
 """
 
 import json
 import sys
 
+from similares import generar_tabla, ruta_tabla
+from utils import asignar_ids
+
 def detectar_categoria(pregunta_texto):
     """Detecta la categoría de una pregunta basándose en palabras clave"""
     pregunta_lower = pregunta_texto.lower()
@@ -60,6 +63,9 @@ def migrar_preguntas(archivo_entrada, archivo_salida):
     print(f"✅ Cargadas {len(preguntas)} preguntas")
     print("🔄 Procesando preguntas...")
     
+    # Ids estables: se asignan una sola vez y quedan guardados en el archivo
+    nuevos_ids = asignar_ids(preguntas)
+    
     # Estadísticas
     stats = {
         "total": len(preguntas),
@@ -103,11 +109,18 @@ def migrar_preguntas(archivo_entrada, archivo_salida):
         print(f"❌ Error al guardar: {e}")
         return False
     
+    # Tabla de preguntas similares (la app la consulta en modo práctica)
+    print("🔎 Calculando preguntas similares...")
+    vecinos, _ = generar_tabla(preguntas, ruta_tabla(archivo_salida))
+    stats['sin_similares'] = int((vecinos[:, 0] < 0).sum())
+    
     # Mostrar estadísticas
     print("\n✅ ¡Migración completada!")
     print(f"\n📊 Estadísticas:")
     print(f"  Total de preguntas: {stats['total']}")
+    print(f"  Ids nuevos asignados: {nuevos_ids}")
     print(f"  Preguntas con imagen: {stats['con_imagen']}")
+    print(f"  Preguntas sin similares: {stats['sin_similares']}")
     print(f"\n  Distribución por categoría:")
     
     for cat, count in sorted(stats['por_categoria'].items()):
@@ -138,6 +151,7 @@ if __name__ == "__main__":
     
     if exito:
         print(f"\n✨ Archivo migrado guardado como: {archivo_salida}")
+        print(f"🔗 Tabla de similares: {ruta_tabla(archivo_salida)} (renómbrala junto con el archivo)")
         print("📝 Puedes reemplazar tu archivo original o usar el nuevo")
         sys.exit(0)
     else:
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Perfil de arranque de la app
+Mide cuánto tarda en importarse cada módulo (python -X importtime) y el tiempo
+hasta el primer render de la página de inicio, en procesos nuevos para que cada
+medición sea un arranque en frío.
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from typing import List, Dict, Tuple
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(DIRECTORIO, "app.py")
+
+# Primer render: AppTest ejecuta el script igual que el servidor, sin abrir un navegador
+SCRIPT_RENDER = f"""
+import time
+inicio = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({APP!r}, default_timeout=60).run()
+if at.exception:
+    raise SystemExit("excepción en el render: " + at.exception[0].value)
+print(time.perf_counter() - inicio)
+"""
+
+def importaciones_de_app() -> List[str]:
+    """Módulos que app.py importa al cargarse (las importaciones de nivel superior del archivo)"""
+    with open(APP, 'r', encoding='utf-8') as f:
+        arbol = ast.parse(f.read(), APP)
+    modulos = []
+    for nodo in arbol.body:
+        if isinstance(nodo, ast.Import):
+            nombres = [alias.name for alias in nodo.names]
+        elif isinstance(nodo, ast.ImportFrom) and nodo.module and not nodo.level:
+            nombres = [nodo.module]
+        else:
+            continue
+        modulos.extend(n for n in nombres if n not in modulos)
+    return modulos
+
+def tiempos_importacion(modulo: str = "app") -> List[Tuple[str, float, float]]:
+    """
+    Importa el módulo en un proceso nuevo con -X importtime y devuelve, por paquete
+    de primer nivel, (nombre, tiempo propio, tiempo acumulado) en milisegundos.
+    Para la app se importan sus dependencias directas, ya que app.py solo corre dentro de Streamlit.
+    """
+    if modulo == "app":
+        codigo = "import " + ", ".join(importaciones_de_app())
+    else:
+        codigo = f"import {modulo}"
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=DIRECTORIO, capture_output=True, text=True
+    )
+    if proceso.returncode != 0:
+        raise RuntimeError(proceso.stderr.strip().splitlines()[-1])
+
+    por_paquete = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        propio, acumulado, nombre = [c.strip() for c in linea[len("import time:"):].split("|")]
+        if not propio.isdigit():
+            continue  # encabezado
+        paquete = nombre.split(".")[0]
+        anterior = por_paquete.get(paquete, (0, 0))
+        # El acumulado del paquete es el de la importación del paquete en sí (incluye sus submódulos)
+        por_paquete[paquete] = (
+            anterior[0] + int(propio),
+            max(anterior[1], int(acumulado)) if nombre == paquete else anterior[1]
+        )
+
+    return sorted(
+        ((p, propio / 1000, acumulado / 1000) for p, (propio, acumulado) in por_paquete.items()),
+        key=lambda fila: fila[1], reverse=True
+    )
+
+def tiempo_primer_render(repeticiones: int = 5) -> List[float]:
+    """Segundos hasta el primer render completo de la app, uno por proceso nuevo"""
+    tiempos = []
+    for _ in range(repeticiones):
+        proceso = subprocess.run(
+            [sys.executable, "-c", SCRIPT_RENDER],
+            cwd=DIRECTORIO, capture_output=True, text=True
+        )
+        if proceso.returncode != 0:
+            raise RuntimeError(proceso.stderr.strip().splitlines()[-1])
+        tiempos.append(float(proceso.stdout.strip().splitlines()[-1]))
+    return tiempos
+
+def registrar_medicion(resultado: Dict, archivo: str):
+    """Agrega la medición al historial (una línea JSON por corrida)"""
+    with open(archivo, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide el arranque en frío de la app")
+    parser.add_argument("--modulo", default="app", help="Módulo a perfilar (por defecto, la app)")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Arranques para el tiempo de primer render")
+    parser.add_argument("--top", type=int, default=15, help="Paquetes a listar")
+    parser.add_argument("--sin-render", action="store_true", help="Medir solo las importaciones")
+    parser.add_argument("--registrar", metavar="ARCHIVO", nargs="?", const="perfil_arranque.jsonl",
+                        help="Agregar el resultado al historial (por defecto perfil_arranque.jsonl)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️  PERFIL DE ARRANQUE")
+    print("=" * 60)
+
+    try:
+        importaciones = tiempos_importacion(args.modulo)
+    except RuntimeError as e:
+        print(f"❌ No se pudo importar {args.modulo}: {e}")
+        sys.exit(1)
+
+    total = sum(propio for _, propio, _ in importaciones)
+    print(f"\n📦 Importaciones: {total:.1f} ms en {len(importaciones)} paquetes")
+    print(f"  {'paquete':<24}{'propio':>10}{'acumulado':>12}")
+    for paquete, propio, acumulado in importaciones[:args.top]:
+        print(f"  {paquete:<24}{propio:>8.1f}ms{acumulado:>10.1f}ms")
+
+    propios = {os.path.splitext(n)[0] for n in os.listdir(DIRECTORIO) if n.endswith(".py")}
+    del_proyecto = [(p, propio) for p, propio, _ in importaciones if p in propios]
+    print(f"\n🗂️  Módulos del proyecto: {sum(t for _, t in del_proyecto):.1f} ms")
+    for paquete, propio in del_proyecto:
+        print(f"  {paquete:<24}{propio:>8.1f}ms")
+
+    resultado = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'modulo': args.modulo,
+        'importacion_ms': round(total, 1),
+        'paquetes': {p: round(propio, 2) for p, propio, _ in importaciones[:args.top]},
+        'proyecto': {p: round(propio, 2) for p, propio in del_proyecto}
+    }
+
+    if not args.sin_render and args.modulo == "app":
+        print(f"\n🖥️  Primer render ({args.repeticiones} arranques)...")
+        try:
+            tiempos = tiempo_primer_render(args.repeticiones)
+        except RuntimeError as e:
+            print(f"❌ La app falló al renderizar: {e}")
+            sys.exit(1)
+        print(f"  mediana: {statistics.median(tiempos) * 1000:.0f} ms")
+        print(f"  mínimo:  {min(tiempos) * 1000:.0f} ms")
+        resultado['primer_render_ms'] = round(statistics.median(tiempos) * 1000)
+
+    if args.registrar:
+        registrar_medicion(resultado, args.registrar)
+        print(f"\n📝 Medición agregada a {args.registrar}")
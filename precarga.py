@@ -0,0 +1,67 @@
+# precarga.py - Precarga en segundo plano de las figuras y fragmentos de las próximas preguntas
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict
+
+# Pool compartido por todas las sesiones del servidor
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="precarga")
+
+def cargar_recursos(pregunta: Dict, banco) -> Dict:
+    """
+    Prepara lo que necesita la página para mostrar una pregunta: la figura (de la cache
+    del banco) y sus fragmentos HTML, que el banco arma la primera vez que se piden.
+    """
+    imagen = pregunta.get("imagen")
+    return {
+        'fragmentos': banco.fragmentos(pregunta),
+        'imagen': banco.leer_imagen(imagen) if imagen else None
+    }
+
+class Precargador:
+    """
+    Recursos precargados de una sesión. Solo se conservan las preguntas de la ventana
+    actual y se deja de precargar al superar el presupuesto de bytes.
+    """
+
+    def __init__(self, max_preguntas: int, max_bytes: int, banco):
+        self.max_preguntas = max_preguntas
+        self.max_bytes = max_bytes
+        self.banco = banco
+        self.recursos = OrderedDict()
+
+    def _bytes_en_uso(self):
+        usados = 0
+        for futuro in self.recursos.values():
+            if futuro.done() and not futuro.exception():
+                imagen = futuro.result()['imagen']
+                usados += len(imagen) if imagen else 0
+        return usados
+
+    def precargar(self, preguntas: List[Dict]):
+        """Encola en segundo plano las próximas preguntas (hasta max_preguntas)"""
+        proximas = preguntas[:self.max_preguntas]
+        # Una pregunta aparece una sola vez por simulacro: el id alcanza como clave
+        claves = [p['id'] for p in proximas]
+
+        # Liberar lo que ya quedó fuera de la ventana
+        for clave in list(self.recursos):
+            if clave not in claves:
+                del self.recursos[clave]
+
+        for clave, pregunta in zip(claves, proximas):
+            if clave in self.recursos:
+                continue
+            if self._bytes_en_uso() >= self.max_bytes:
+                break
+            self.recursos[clave] = _pool.submit(cargar_recursos, pregunta, self.banco)
+
+    def obtener(self, pregunta: Dict) -> Dict:
+        """Devuelve los recursos de la pregunta: precargados si están, o cargados en el momento"""
+        futuro = self.recursos.pop(pregunta['id'], None)
+        if futuro is not None:
+            try:
+                return futuro.result()
+            except OSError:
+                pass
+        return cargar_recursos(pregunta, self.banco)
@@ -0,0 +1,136 @@
+# progreso.py - Progreso de cada usuario como conjuntos de bits sobre los ids de las preguntas
+
+import os
+import re
+import struct
+import threading
+import unicodedata
+import zlib
+from contextlib import contextmanager
+from typing import List, Tuple, Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: solo se protege entre hilos del mismo proceso
+    fcntl = None
+
+DIRECTORIO_PROGRESO = "progreso"
+MAGIA = b"PPB1"
+
+# Posiciones de los bits encendidos de cada byte posible
+_BITS_DE_BYTE = [tuple(j for j in range(8) if b >> j & 1) for b in range(256)]
+
+_lock = threading.Lock()
+
+def ids_a_bits(ids: Iterable[int]) -> int:
+    """Conjunto de ids (no negativos) como entero: el bit i está encendido si el id i pertenece"""
+    ids = [i for i in ids if i >= 0]
+    if not ids:
+        return 0
+    datos = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        datos[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(datos, 'little')
+
+def bits_a_ids(bits: int) -> List[int]:
+    """Ids de los bits encendidos, en orden; solo se recorren los bytes no nulos"""
+    datos = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    return [i * 8 + j for i, b in enumerate(datos) if b for j in _BITS_DE_BYTE[b]]
+
+def contar_bits(bits: int) -> int:
+    return bin(bits).count("1")
+
+def normalizar_usuario(nombre: str) -> Optional[str]:
+    """Nombre de usuario apto para nombre de archivo (sin tildes, minúsculas); None si queda vacío"""
+    if not nombre:
+        return None
+    sin_tildes = unicodedata.normalize('NFKD', nombre.strip().lower()).encode('ascii', 'ignore').decode('ascii')
+    usuario = re.sub(r"[^a-z0-9]+", "_", sin_tildes).strip("_")[:40]
+    return usuario or None
+
+class Progreso:
+    """
+    Qué preguntas vio, falló y domina un usuario, acumulado sobre todos sus intentos.
+    Una pregunta fallada queda pendiente de repaso hasta que se responde bien.
+    """
+
+    __slots__ = ('vistas', 'falladas', 'dominadas')
+
+    def __init__(self, vistas: int = 0, falladas: int = 0, dominadas: int = 0):
+        self.vistas = vistas
+        self.falladas = falladas
+        self.dominadas = dominadas
+
+    @property
+    def pendientes(self) -> int:
+        """Falladas alguna vez y todavía no respondidas bien"""
+        return self.falladas & ~self.dominadas
+
+    def registrar(self, respuestas: List[Tuple[int, bool]]):
+        """Suma un intento, dado como pares (id de pregunta, si fue correcta)"""
+        aciertos = ids_a_bits(i for i, correcta in respuestas if correcta)
+        errores = ids_a_bits(i for i, correcta in respuestas if not correcta)
+        self.vistas |= aciertos | errores
+        self.falladas |= errores
+        self.dominadas = (self.dominadas | aciertos) & ~errores
+
+    def a_bytes(self) -> bytes:
+        partes = [b.to_bytes((b.bit_length() + 7) // 8, 'little') for b in (self.vistas, self.falladas, self.dominadas)]
+        return MAGIA + struct.pack('<3I', *(len(p) for p in partes)) + zlib.compress(b"".join(partes))
+
+    @classmethod
+    def de_bytes(cls, datos: bytes) -> 'Progreso':
+        if datos[:4] != MAGIA:
+            raise ValueError("formato de progreso desconocido")
+        largos = struct.unpack('<3I', datos[4:16])
+        crudo = zlib.decompress(datos[16:])
+        valores, inicio = [], 0
+        for largo in largos:
+            valores.append(int.from_bytes(crudo[inicio:inicio + largo], 'little'))
+            inicio += largo
+        return cls(*valores)
+
+def ruta_progreso(banco_id: str, usuario: str, directorio: str = DIRECTORIO_PROGRESO) -> str:
+    return os.path.join(directorio, banco_id, f"{usuario}.bin")
+
+def cargar_progreso(banco_id: str, usuario: str, directorio: str = DIRECTORIO_PROGRESO) -> Progreso:
+    """Progreso guardado del usuario en ese banco (vacío si no tiene o si el archivo está dañado)"""
+    try:
+        with open(ruta_progreso(banco_id, usuario, directorio), 'rb') as f:
+            return Progreso.de_bytes(f.read())
+    except (OSError, ValueError, zlib.error, struct.error):
+        return Progreso()
+
+@contextmanager
+def bloqueo_archivo(ruta: str):
+    """
+    Exclusión entre procesos (varios servidores sobre el mismo directorio) sobre un archivo
+    de bloqueo aparte: los archivos protegidos se reemplazan al escribir y no sirven para
+    bloquearlos. También la usa el tablero del instructor.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(ruta + ".lock", 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+def registrar_progreso(banco_id: str, usuario: str, respuestas: List[Tuple[int, bool]],
+                       directorio: str = DIRECTORIO_PROGRESO) -> Progreso:
+    """
+    Suma un intento al progreso guardado y lo reescribe de forma atómica. Leer, sumar y
+    escribir se hace con el archivo bloqueado, así dos procesos no pisan sus intentos.
+    """
+    ruta = ruta_progreso(banco_id, usuario, directorio)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with _lock, bloqueo_archivo(ruta):
+        progreso = cargar_progreso(banco_id, usuario, directorio)
+        progreso.registrar(respuestas)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'wb') as f:
+            f.write(progreso.a_bytes())
+        os.replace(temporal, ruta)
+    return progreso
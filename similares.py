@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Preguntas similares
+Calcula, una sola vez y fuera de la app, los vecinos más cercanos de cada pregunta
+según TF-IDF sobre el enunciado y las opciones. La app solo consulta la tabla.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import unicodedata
+from typing import List, Dict
+
+import numpy as np
+
+# Vecinos guardados por pregunta (la app descarta los que ya salieron en la sesión)
+VECINOS_POR_PREGUNTA = 10
+# Productos parciales (y celdas de similitud) por lote, para acotar la memoria
+ELEMENTOS_POR_LOTE = 8_000_000
+
+PALABRAS_VACIAS = {
+    "las", "los", "del", "que", "por", "para", "con", "una", "uno", "unos", "unas", "sus",
+    "como", "cual", "cuales", "cuando", "donde", "esta", "este", "estos", "estas", "ese",
+    "esa", "son", "ser", "sea", "sin", "sobre", "entre", "hasta", "desde", "mas", "muy",
+    "pero", "porque", "tiene", "tienen", "hay", "debe", "puede", "otro", "otra", "todas",
+    "todos", "ninguna", "ninguno", "anteriores", "correcta", "correctas", "incorrecta"
+}
+
+def ruta_tabla(archivo_banco: str) -> str:
+    """Archivo de la tabla de vecinos que corresponde a un banco"""
+    return os.path.splitext(archivo_banco)[0] + "_similares.npz"
+
+def _tokens(texto: str) -> List[str]:
+    sin_tildes = unicodedata.normalize('NFKD', texto.lower()).encode('ascii', 'ignore').decode('ascii')
+    return [t for t in re.findall(r"[a-z0-9]+", sin_tildes) if len(t) > 2 and t not in PALABRAS_VACIAS]
+
+def _texto(pregunta: Dict) -> str:
+    return " ".join([pregunta.get('pregunta', '')] + list(pregunta.get('opciones', [])))
+
+def firmas_textos(preguntas: List[Dict]) -> np.ndarray:
+    """Firma del texto de cada pregunta: si cambia, su fila de la tabla ya no vale"""
+    return np.array([
+        int.from_bytes(hashlib.blake2b(_texto(p).encode('utf-8'), digest_size=8).digest(), 'little', signed=True)
+        for p in preguntas
+    ], dtype=np.int64)
+
+def matriz_tfidf(preguntas: List[Dict]):
+    """
+    Vectores TF-IDF (tf sublineal, normalizados) en formato CSR:
+    devuelve (indptr, indices, valores, cantidad de términos)
+    """
+    vocabulario = {}
+    filas, columnas = [], []
+    for i, pregunta in enumerate(preguntas):
+        for token in _tokens(_texto(pregunta)):
+            filas.append(i)
+            columnas.append(vocabulario.setdefault(token, len(vocabulario)))
+
+    n = len(preguntas)
+    filas = np.array(filas, dtype=np.int64)
+    columnas = np.array(columnas, dtype=np.int64)
+
+    # Frecuencia de cada (pregunta, término), ordenada por pregunta
+    pares, tf = np.unique(filas * len(vocabulario) + columnas, return_counts=True)
+    filas, columnas = pares // max(len(vocabulario), 1), pares % max(len(vocabulario), 1)
+
+    df = np.bincount(columnas, minlength=len(vocabulario))
+    idf = np.log((1 + n) / (1 + df)) + 1
+    valores = (1 + np.log(tf)) * idf[columnas]
+
+    normas = np.sqrt(np.bincount(filas, weights=valores ** 2, minlength=n))
+    valores = (valores / normas[filas]).astype(np.float32)
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(filas, minlength=n))])
+    return indptr, columnas, valores, len(vocabulario)
+
+def _lotes(trabajo: np.ndarray, n: int):
+    """Cortes de filas consecutivas cuyo trabajo y celdas de similitud entran en ELEMENTOS_POR_LOTE"""
+    max_filas = max(1, ELEMENTOS_POR_LOTE // max(n, 1))
+    desde, acumulado = 0, 0
+    for fila, costo in enumerate(trabajo):
+        if fila > desde and (acumulado + costo > ELEMENTOS_POR_LOTE or fila - desde >= max_filas):
+            yield desde, fila
+            desde, acumulado = fila, 0
+        acumulado += costo
+    if desde < len(trabajo):
+        yield desde, len(trabajo)
+
+def calcular_vecinos(preguntas: List[Dict], k: int = VECINOS_POR_PREGUNTA):
+    """
+    Similitud coseno de todas contra todas con un índice invertido: cada término de una
+    pregunta suma solo contra las preguntas que también lo usan, así el trabajo es la
+    cantidad de pares que comparten términos y no n x términos. Por lotes y sin bucles
+    por pregunta. Devuelve (vecinos, similitudes), matrices n x k con los ids más
+    parecidos de cada pregunta (-1 donde no hay ninguno con palabras en común).
+    """
+    indptr, indices, valores, n_terminos = matriz_tfidf(preguntas)
+    n = len(preguntas)
+    ids = np.array([p['id'] for p in preguntas], dtype=np.int64)
+    k = max(1, min(k, n - 1))
+
+    vecinos = np.full((n, k), -1, dtype=np.int64)
+    similitudes = np.zeros((n, k), dtype=np.float32)
+    if not len(indices):
+        return vecinos, similitudes
+
+    # Índice invertido (la matriz por columnas): preguntas y pesos de cada término
+    fila_de_entrada = np.repeat(np.arange(n), np.diff(indptr))
+    por_termino = np.argsort(indices, kind='stable')
+    filas_termino = fila_de_entrada[por_termino]
+    valores_termino = valores[por_termino]
+    frecuencia = np.bincount(indices, minlength=n_terminos)
+    inicio_termino = np.concatenate([[0], np.cumsum(frecuencia)])
+
+    # Productos parciales que genera cada pregunta, para armar lotes de trabajo parejo
+    trabajo = np.bincount(fila_de_entrada, weights=frecuencia[indices], minlength=n).astype(np.int64)
+
+    for desde, hasta in _lotes(trabajo, n):
+        a, b = indptr[desde], indptr[hasta]
+        terminos = indices[a:b]
+        largos = frecuencia[terminos]
+        # Posición en el índice de cada pregunta que comparte cada término del lote
+        saltos = np.repeat(inicio_termino[terminos] - (np.cumsum(largos) - largos), largos)
+        posiciones = saltos + np.arange(largos.sum())
+        destino = np.repeat(fila_de_entrada[a:b] - desde, largos) * n + filas_termino[posiciones]
+        aportes = np.repeat(valores[a:b], largos) * valores_termino[posiciones]
+        similitud = np.bincount(destino, weights=aportes, minlength=(hasta - desde) * n)
+        similitud = similitud.reshape(hasta - desde, n).astype(np.float32)
+        similitud[np.arange(hasta - desde), np.arange(desde, hasta)] = -1  # la pregunta misma
+
+        mejores = np.argpartition(-similitud, k - 1, axis=1)[:, :k]
+        orden = np.argsort(-np.take_along_axis(similitud, mejores, axis=1), axis=1)
+        mejores = np.take_along_axis(mejores, orden, axis=1)
+        valores_mejores = np.take_along_axis(similitud, mejores, axis=1)
+
+        vecinos[desde:hasta] = np.where(valores_mejores > 0, ids[mejores], -1)
+        similitudes[desde:hasta] = np.maximum(valores_mejores, 0)
+
+    return vecinos, similitudes
+
+def generar_tabla(preguntas: List[Dict], archivo_tabla: str, k: int = VECINOS_POR_PREGUNTA):
+    """Calcula los vecinos y los guarda junto con la firma del texto de cada pregunta"""
+    vecinos, similitudes = calcular_vecinos(preguntas, k)
+    temporal = archivo_tabla + ".tmp"
+    with open(temporal, 'wb') as f:
+        np.savez_compressed(
+            f,
+            ids=np.array([p['id'] for p in preguntas], dtype=np.int64),
+            vecinos=vecinos.astype(np.int32),
+            similitudes=similitudes.astype(np.float16),
+            firmas=firmas_textos(preguntas)
+        )
+    os.replace(temporal, archivo_tabla)
+    return vecinos, similitudes
+
+class TablaVecinos:
+    """Vecinos precalculados de un banco; la consulta es un acceso directo por id"""
+
+    def __init__(self, ids, vecinos):
+        self.fila_de = {int(i): fila for fila, i in enumerate(ids)}
+        self.vecinos = vecinos
+
+    def __len__(self):
+        return len(self.fila_de)
+
+    def vecinos_de(self, id_pregunta: int) -> List[int]:
+        """Ids de las preguntas más parecidas, de mayor a menor similitud"""
+        fila = self.fila_de.get(id_pregunta)
+        if fila is None:
+            return []
+        return [int(i) for i in self.vecinos[fila] if i >= 0]
+
+def cargar_tabla(archivo_tabla: str, preguntas: List[Dict]):
+    """
+    Carga la tabla si existe y corresponde a estas preguntas; si no, None. Que falten
+    preguntas (p. ej. descartadas por la validación) no la invalida, que cambie un texto sí.
+    """
+    if not os.path.exists(archivo_tabla):
+        return None
+    with np.load(archivo_tabla) as datos:
+        tabla = TablaVecinos(datos['ids'], datos['vecinos'])
+        firmas = datos['firmas']
+    filas = [tabla.fila_de.get(p['id'], -1) for p in preguntas]
+    if min(filas, default=0) < 0 or not np.array_equal(firmas[filas], firmas_textos(preguntas)):
+        return None
+    return tabla
+
+if __name__ == "__main__":
+    archivo = sys.argv[1] if len(sys.argv) > 1 else "datos_quiz.json"
+
+    print(f"🔎 Calculando preguntas similares de {archivo}...")
+    try:
+        with open(archivo, 'r', encoding='utf-8') as f:
+            preguntas = json.load(f)
+    except FileNotFoundError:
+        print(f"❌ Error: No se encontró el archivo {archivo}")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"❌ Error: El archivo {archivo} no es un JSON válido ({e})")
+        sys.exit(1)
+    if any('id' not in p for p in preguntas):
+        print("❌ Error: Hay preguntas sin 'id'; ejecuta migrar_preguntas.py para asignarlos")
+        sys.exit(1)
+
+    vecinos, similitudes = generar_tabla(preguntas, ruta_tabla(archivo))
+    sin_vecinos = int((vecinos[:, 0] < 0).sum())
+    print(f"✅ {len(preguntas)} preguntas, {vecinos.shape[1]} vecinos por pregunta")
+    print(f"  Similitud media del más cercano: {similitudes[:, 0].mean():.2f}")
+    if sin_vecinos:
+        print(f"  ⚠️ {sin_vecinos} preguntas sin ninguna parecida")
+    print(f"💾 Tabla guardada en {ruta_tabla(archivo)}")
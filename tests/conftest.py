@@ -0,0 +1,6 @@
+# conftest.py - Los módulos de la app están en la raíz del repositorio, sin paquete
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,81 @@
+# test_adaptativo.py - Estimación de Rasch e índice de dificultad
+
+import math
+import random
+
+import adaptativo
+from adaptativo import IndiceDificultad, estimar_habilidad, probabilidad_acierto, LIMITE_LOGIT
+
+def test_habilidad_anula_el_gradiente_del_map():
+    random.seed(0)
+    respuestas = [(random.uniform(-2, 2), random.random() < 0.6) for _ in range(40)]
+    habilidad, error = estimar_habilidad(respuestas)
+    # Con prior normal estándar: -θ + Σ (x - p) = 0 en el máximo
+    gradiente = -habilidad + sum(float(x) - probabilidad_acierto(habilidad, d) for d, x in respuestas)
+    assert abs(gradiente) < 1e-3
+    informacion = 1 + sum(probabilidad_acierto(habilidad, d) * (1 - probabilidad_acierto(habilidad, d))
+                          for d, _ in respuestas)
+    assert math.isclose(error, 1 / math.sqrt(informacion), rel_tol=1e-3)
+
+def test_habilidad_simetrica_y_acotada():
+    bien, _ = estimar_habilidad([(0.5, True)] * 10)
+    mal, _ = estimar_habilidad([(-0.5, False)] * 10)
+    assert bien > 0 and math.isclose(bien, -mal, abs_tol=1e-3)
+    extremo, _ = estimar_habilidad([(LIMITE_LOGIT, True)] * 500)
+    assert extremo == LIMITE_LOGIT
+
+def test_sin_respuestas_queda_en_el_prior():
+    assert estimar_habilidad([]) == (0.0, 1.0)
+
+def _indice(n=60, semilla=0):
+    rng = random.Random(semilla)
+    preguntas = [{'id': i} for i in range(n)]
+    dificultades = {i: round(rng.uniform(-3, 3), 3) for i in range(n)}
+    return IndiceDificultad(IndiceDificultad.ordenar(preguntas, dificultades)), dificultades
+
+def test_extrae_la_mas_cercana_sin_repetir(monkeypatch):
+    monkeypatch.setattr(adaptativo, "CANDIDATOS_CERCANOS", 1)
+    indice, dificultades = _indice()
+    random.seed(1)
+    entregadas = set()
+    while len(indice):
+        habilidad = random.uniform(-3.5, 3.5)
+        id_pregunta, dificultad = indice.extraer_cercana(habilidad)
+        restantes = [d for i, d in dificultades.items() if i not in entregadas]
+        assert abs(dificultad - habilidad) == min(abs(d - habilidad) for d in restantes)
+        assert dificultades[id_pregunta] == dificultad
+        assert id_pregunta not in entregadas
+        entregadas.add(id_pregunta)
+    assert entregadas == set(dificultades)
+
+def test_candidatas_entre_las_cercanas():
+    indice, dificultades = _indice(semilla=2)
+    cercanas = sorted(dificultades, key=lambda i: abs(dificultades[i] - 0.4))[:adaptativo.CANDIDATOS_CERCANOS]
+    id_pregunta, _ = indice.extraer_cercana(0.4)
+    assert id_pregunta in cercanas
+
+def test_reconstruir_con_entregadas():
+    indice, dificultades = _indice(n=10)
+    entregadas = [0, 1, 2]
+    reconstruido = IndiceDificultad((indice.dificultades, indice.ids), entregadas)
+    assert len(reconstruido) == 7
+    while len(reconstruido):
+        assert reconstruido.extraer_cercana(0.0)[0] not in entregadas
+
+def test_empates_se_sortean_en_todo_el_bloque():
+    # Sin análisis de ítems todas las preguntas tienen dificultad 0
+    preguntas = [{'id': i} for i in range(300)]
+    orden = IndiceDificultad.ordenar(preguntas, {i: 0.0 for i in range(300)})
+    random.seed(3)
+    servidas = set()
+    for _ in range(100):
+        indice = IndiceDificultad(orden)
+        sesion = [indice.extraer_cercana(random.uniform(-1, 1))[0] for _ in range(20)]
+        assert len(set(sesion)) == len(sesion)
+        servidas.update(sesion)
+    assert len(servidas) > 280
+
+def test_bloque_empatado_se_agota_sin_repetir():
+    preguntas = [{'id': i} for i in range(25)]
+    indice = IndiceDificultad(IndiceDificultad.ordenar(preguntas, {i: 0.0 for i in range(25)}))
+    assert sorted(indice.extraer_cercana(0.0)[0] for _ in range(25)) == list(range(25))
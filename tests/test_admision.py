@@ -0,0 +1,67 @@
+# test_admision.py - Cola de inicios por orden de llegada y liberación de sesiones
+
+import threading
+import time
+
+import pytest
+
+from admision import ControlAdmision, RegistroSesiones, TurnoVencido
+
+def _esperar(condicion, limite=5.0):
+    fin = time.monotonic() + limite
+    while not condicion():
+        assert time.monotonic() < fin, "la condición no se cumplió a tiempo"
+        time.sleep(0.005)
+
+def test_atiende_por_orden_de_llegada():
+    control = ControlAdmision(max_concurrentes=1, espera_maxima=10)
+    orden = []
+
+    def pedir(numero):
+        with control.turno():
+            orden.append(numero)
+
+    hilos = []
+    with control.turno():
+        # Cada pedido entra a la cola recién cuando el anterior ya está esperando
+        for numero in range(8):
+            hilo = threading.Thread(target=pedir, args=(numero,))
+            hilo.start()
+            hilos.append(hilo)
+            _esperar(lambda: control.en_cola == numero + 1)
+    for hilo in hilos:
+        hilo.join()
+
+    assert orden == list(range(8))
+    assert control.max_en_cola == 8
+    assert control.metricas()['admitidos'] == 9
+
+def test_sin_espera_no_cuenta_como_cola():
+    control = ControlAdmision(max_concurrentes=2, espera_maxima=1)
+    with control.turno():
+        with control.turno():
+            pass
+    assert control.max_en_cola == 0
+    assert control.metricas()['en_curso'] == 0
+
+def test_turno_vencido_no_traba_la_cola():
+    control = ControlAdmision(max_concurrentes=1, espera_maxima=0.05)
+    with control.turno():
+        with pytest.raises(TurnoVencido):
+            with control.turno():
+                pass
+    assert control.rechazados == 1
+    assert control.en_cola == 0
+    # El número vencido se saltea: el siguiente entra sin esperar
+    with control.turno():
+        pass
+    assert control.admitidos == 2
+
+def test_registro_libera_sesiones_inactivas():
+    registro = RegistroSesiones(inactividad=0.05)
+    registro.datos("a")['precargador'] = object()
+    time.sleep(0.1)
+    registro.datos("b")
+    assert registro.expirar() == 1
+    assert len(registro) == 1
+    assert registro.datos("a") == {}
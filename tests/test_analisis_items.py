@@ -0,0 +1,68 @@
+# test_analisis_items.py - Punto-biserial con bincount contra el cálculo directo
+
+import numpy as np
+
+from analisis_items import _estado_vacio, acumular_lote, calcular_metricas
+
+def _banco_e_intentos(n_preguntas=12, n_intentos=300, semilla=0):
+    rng = np.random.default_rng(semilla)
+    preguntas = [{'id': i, 'opciones': ["a", "b", "c", "d"], 'correcta': int(rng.integers(4))}
+                 for i in range(n_preguntas)]
+    habilidades = rng.normal(size=n_intentos)
+    intentos = []
+    for habilidad in habilidades:
+        respondidas = rng.choice(n_preguntas, size=int(rng.integers(3, n_preguntas + 1)), replace=False)
+        respuestas = []
+        for i in respondidas:
+            acierta = rng.random() < 1 / (1 + np.exp(-habilidad))
+            opcion = preguntas[i]['correcta'] if acierta else int(rng.integers(4))
+            respuestas.append([int(i), opcion])
+        intentos.append({'respuestas': respuestas})
+    claves = np.array([p['correcta'] for p in preguntas])
+    return preguntas, intentos, claves
+
+def _directo(preguntas, intentos, claves):
+    """Por pregunta: acierto y proporción de aciertos en el resto del intento, y su correlación"""
+    pares = {p['id']: [] for p in preguntas}
+    for intento in intentos:
+        aciertos = {i: float(o == claves[i]) for i, o in intento['respuestas']}
+        for i, x in aciertos.items():
+            resto = (sum(aciertos.values()) - x) / (len(aciertos) - 1) if len(aciertos) > 1 else 0.0
+            pares[i].append((x, resto))
+    resultado = {}
+    for i, lista in pares.items():
+        x, r = np.array(lista).T
+        resultado[i] = (x.mean(), np.corrcoef(x, r)[0, 1], len(lista))
+    return resultado
+
+def _metricas(preguntas, intentos, claves, lotes=1):
+    estado = _estado_vacio(len(claves), 4, "")
+    for lote in np.array_split(np.arange(len(intentos)), lotes):
+        acumular_lote(estado, [intentos[i] for i in lote], claves)
+    return {m['id']: m for m in calcular_metricas(estado, preguntas)}
+
+def test_punto_biserial_coincide_con_correlacion_directa():
+    preguntas, intentos, claves = _banco_e_intentos()
+    metricas = _metricas(preguntas, intentos, claves)
+    for i, (p, rpb, n) in _directo(preguntas, intentos, claves).items():
+        assert metricas[i]['n'] == n
+        assert np.isclose(metricas[i]['p'], p)
+        assert np.isclose(metricas[i]['discriminacion'], rpb)
+
+def test_acumular_por_lotes_da_lo_mismo():
+    preguntas, intentos, claves = _banco_e_intentos(semilla=1)
+    de_una_vez = _metricas(preguntas, intentos, claves)
+    por_lotes = _metricas(preguntas, intentos, claves, lotes=7)
+    for i, m in de_una_vez.items():
+        assert np.isclose(m['discriminacion'], por_lotes[i]['discriminacion'])
+        assert m['tasas_opciones'] == por_lotes[i]['tasas_opciones']
+
+def test_tasas_de_opciones():
+    preguntas = [{'id': 0, 'opciones': ["a", "b", "c"], 'correcta': 1}]
+    claves = np.array([1])
+    intentos = [{'respuestas': [[0, 1]]}, {'respuestas': [[0, 1]]}, {'respuestas': [[0, 2]]}, {'respuestas': [[0, 1]]}]
+    estado = _estado_vacio(1, 3, "")
+    acumular_lote(estado, intentos, claves)
+    metrica = calcular_metricas(estado, preguntas)[0]
+    assert metrica['p'] == 0.75
+    assert metrica['tasas_opciones'] == [0.0, 0.75, 0.25]
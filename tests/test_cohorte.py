@@ -0,0 +1,114 @@
+# test_cohorte.py - Tablero del instructor: diario, compactación y preguntas más difíciles
+
+import heapq
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import cohorte
+from cohorte import Tablero, resumir_intento, MIN_RESPUESTAS_DIFICIL, PREGUNTAS_DIFICILES
+
+def _intento(rng, n_preguntas=30, usuario=None):
+    respuestas = [{'id': rng.randrange(n_preguntas), 'correcta': rng.random() < 0.5} for _ in range(8)]
+    correctas = sum(r['correcta'] for r in respuestas)
+    stats = {
+        'porcentaje': correctas / len(respuestas) * 100,
+        'por_categoria': {'motor': {'porcentaje': correctas / len(respuestas) * 100,
+                                    'total': len(respuestas), 'correctas': correctas}}
+    }
+    return resumir_intento(stats, respuestas, 'practica', usuario)
+
+def _leido(archivo):
+    tablero = Tablero(archivo)
+    tablero.sincronizar()
+    return tablero
+
+def _comparables(tablero):
+    tablero.sincronizar()
+    return tablero.resumen(), tablero.por_pregunta
+
+def test_otro_proceso_reproduce_el_diario(tmp_path):
+    archivo = str(tmp_path / "cohorte.json")
+    rng = random.Random(0)
+    escritor, lector = Tablero(archivo), Tablero(archivo)
+    for k in range(25):
+        escritor.registrar(_intento(rng, usuario=f"alumno{k % 4}"))
+        if k % 7 == 0:
+            lector.sincronizar()
+    assert _comparables(lector) == _comparables(escritor)
+    assert lector.resumen()['intentos'] == 25
+    assert lector.resumen()['usuarios'] == 4
+
+def test_escritores_alternados_no_desalinean_el_diario(tmp_path):
+    archivo = str(tmp_path / "cohorte.json")
+    rng = random.Random(1)
+    a, b = Tablero(archivo), Tablero(archivo)
+    for k in range(40):
+        (a if k % 3 else b).registrar(_intento(rng))
+    assert _comparables(a) == _comparables(b)
+    assert a.resumen()['intentos'] == 40
+
+def test_compactacion_por_generaciones(tmp_path, monkeypatch):
+    monkeypatch.setattr(cohorte, "COMPACTAR_CADA", 10)
+    archivo = str(tmp_path / "cohorte.json")
+    rng = random.Random(2)
+    tablero = Tablero(archivo)
+    for _ in range(25):
+        tablero.registrar(_intento(rng))
+
+    assert tablero.generacion == 2
+    with open(archivo, 'r', encoding='utf-8') as f:
+        assert json.load(f)['intentos'] == 20
+    # Solo queda el diario de la generación vigente, con lo posterior a la foto
+    assert sorted(os.listdir(tmp_path)) == ["cohorte.2.jsonl", "cohorte.json", "cohorte.json.lock"]
+    assert _comparables(Tablero(archivo)) == _comparables(tablero)
+
+def test_diario_viejo_no_se_cuenta_dos_veces(tmp_path, monkeypatch):
+    monkeypatch.setattr(cohorte, "COMPACTAR_CADA", 5)
+    archivo = str(tmp_path / "cohorte.json")
+    rng = random.Random(3)
+    tablero = Tablero(archivo)
+    for _ in range(5):
+        tablero.registrar(_intento(rng))
+    # Corte entre escribir la foto y borrar el diario anterior
+    with open(str(tmp_path / "cohorte.0.jsonl"), 'w', encoding='utf-8') as f:
+        f.write(json.dumps(_intento(rng)) + "\n")
+    assert _leido(archivo).resumen()['intentos'] == 5
+
+def test_linea_danada_se_saltea(tmp_path):
+    archivo = str(tmp_path / "cohorte.json")
+    rng = random.Random(4)
+    tablero = Tablero(archivo)
+    tablero.registrar(_intento(rng))
+    with open(tablero.diario, 'ab') as f:
+        f.write(b'{"modo": "pra\n')
+    tablero.registrar(_intento(rng))
+    assert _leido(archivo).resumen()['intentos'] == 2
+
+def test_mas_dificiles_coincide_con_el_orden_completo(tmp_path):
+    rng = random.Random(5)
+    tablero = Tablero(str(tmp_path / "cohorte.json"))
+    for _ in range(300):
+        tablero.aplicar(_intento(rng, n_preguntas=40))
+    elegibles = ((i, n, c) for i, (n, c) in tablero.por_pregunta.items() if n >= MIN_RESPUESTAS_DIFICIL)
+    esperadas = heapq.nsmallest(PREGUNTAS_DIFICILES, elegibles, key=lambda t: (t[2] / t[1], -t[1], t[0]))
+    assert tablero.mas_dificiles() == [list(t) for t in esperadas]
+
+def _registrar_varios(archivo, semilla, cantidad, compactar_cada):
+    cohorte.COMPACTAR_CADA = compactar_cada
+    rng = random.Random(semilla)
+    tablero = Tablero(archivo)
+    for _ in range(cantidad):
+        tablero.registrar(_intento(rng))
+
+def test_procesos_concurrentes_no_pierden_intentos(tmp_path):
+    archivo = str(tmp_path / "cohorte.json")
+    procesos, por_proceso = 4, 40
+    with ProcessPoolExecutor(procesos) as pool:
+        trabajos = [pool.submit(_registrar_varios, archivo, p, por_proceso, 25) for p in range(procesos)]
+        for trabajo in trabajos:
+            trabajo.result()
+    tablero = _leido(archivo)
+    assert tablero.resumen()['intentos'] == procesos * por_proceso
+    assert sum(n for n, _ in tablero.por_pregunta.values()) == procesos * por_proceso * 8
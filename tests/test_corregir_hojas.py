@@ -0,0 +1,73 @@
+# test_corregir_hojas.py - Corrección vectorizada contra calcular_estadisticas
+
+import csv
+import json
+
+import numpy as np
+
+from corregir_hojas import (cargar_claves, corregir, corregir_hojas, parsear_respuestas,
+                            LETRAS, SIN_RESPUESTA)
+from utils import calcular_estadisticas
+
+CATEGORIAS = {'motor': "Motor", 'clima': "Clima"}
+
+def _claves(tmp_path, n_formularios=6, semilla=0):
+    rng = np.random.default_rng(semilla)
+    claves = []
+    for formulario in range(1, n_formularios + 1):
+        largo = int(rng.integers(5, 12))
+        claves.append({
+            'formulario': formulario,
+            'preguntas': [int(i) for i in rng.choice(100, size=largo, replace=False)],
+            'respuestas': [int(r) for r in rng.integers(4, size=largo)],
+            'categorias': [str(c) for c in rng.choice(['motor', 'clima', 'reglamento'], size=largo)]
+        })
+    archivo = tmp_path / "claves.jsonl"
+    archivo.write_text("".join(json.dumps(c) + "\n" for c in claves), encoding='utf-8')
+    return str(archivo), claves
+
+def test_corregir_coincide_con_calcular_estadisticas(tmp_path):
+    archivo, claves = _claves(tmp_path)
+    matriz_clave, matriz_categoria, _, categorias = cargar_claves(archivo, CATEGORIAS)
+    rng = np.random.default_rng(1)
+    hojas = [claves[int(i)] for i in rng.integers(len(claves), size=50)]
+    formularios = np.array([c['formulario'] for c in hojas])
+    respuestas = np.full((len(hojas), matriz_clave.shape[1]), SIN_RESPUESTA, dtype=np.int8)
+    for fila, clave in zip(respuestas, hojas):
+        fila[:len(clave['respuestas'])] = rng.integers(-1, 4, size=len(clave['respuestas']))
+
+    resultados = corregir(formularios, respuestas, matriz_clave, matriz_categoria, categorias)
+    for clave, fila, resultado in zip(hojas, respuestas, resultados):
+        esperado = calcular_estadisticas([
+            {'correcta': int(r) == correcta, 'categoria': categoria}
+            for r, correcta, categoria in zip(fila, clave['respuestas'], clave['categorias'])
+        ])
+        assert resultado == esperado
+
+def test_respuestas_fuera_de_rango_quedan_en_blanco():
+    fila = parsear_respuestas("0,300,2,,-,99999999999,9", 8)
+    assert fila.tolist() == [0, SIN_RESPUESTA, 2, SIN_RESPUESTA, SIN_RESPUESTA, SIN_RESPUESTA, 9, SIN_RESPUESTA]
+    assert parsear_respuestas("a?cz", 4).tolist() == [0, SIN_RESPUESTA, 2, SIN_RESPUESTA]
+    assert parsear_respuestas(",".join(["300"] * 3), 3).tolist() == [SIN_RESPUESTA] * 3
+    assert len(LETRAS) <= np.iinfo(np.int8).max
+
+def test_formulario_mal_escrito_no_corta_el_lote(tmp_path):
+    archivo_claves, claves = _claves(tmp_path, n_formularios=2)
+    archivo_hojas = tmp_path / "hojas.csv"
+    with open(archivo_hojas, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["alumno", "formulario", "respuestas"])
+        escritor.writerow(["ana", "1", "".join(LETRAS[r] for r in claves[0]['respuestas'])])
+        escritor.writerow(["beto", "uno", "abcd"])
+        escritor.writerow(["caro", "", "abcd"])
+        escritor.writerow(["dani", "7", "abcd"])
+        escritor.writerow(["eli", "99999999999999999999", "abcd"])
+    salida = tmp_path / "resultados.jsonl"
+
+    alumnos, resultados = corregir_hojas(str(archivo_hojas), archivo_claves, str(salida), CATEGORIAS)
+    assert alumnos == ["ana", "beto", "caro", "dani", "eli"]
+    assert resultados[0]['porcentaje'] == 100
+    assert resultados[1:] == [{}] * 4
+    lineas = [json.loads(linea) for linea in salida.read_text(encoding='utf-8').splitlines()]
+    assert [l['formulario'] for l in lineas] == [1, "uno", "", 7, 99999999999999999999]
+    assert [l.get('formulario_desconocido', False) for l in lineas] == [False, True, True, True, True]
@@ -0,0 +1,60 @@
+# test_progreso.py - Conjuntos de bits del progreso y escritura concurrente
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from progreso import (
+    Progreso, ids_a_bits, bits_a_ids, contar_bits, cargar_progreso, registrar_progreso, normalizar_usuario
+)
+
+def test_bits_ida_y_vuelta():
+    random.seed(0)
+    for _ in range(50):
+        ids = sorted(random.sample(range(5000), random.randint(0, 200)))
+        bits = ids_a_bits(ids)
+        assert bits_a_ids(bits) == ids
+        assert contar_bits(bits) == len(ids)
+
+def test_bits_vacio_y_negativos():
+    assert ids_a_bits([]) == 0
+    assert bits_a_ids(0) == []
+    assert ids_a_bits([-1, 3, 3]) == 1 << 3
+
+def test_progreso_serializado():
+    progreso = Progreso()
+    progreso.registrar([(1, True), (2, False), (900, False)])
+    copia = Progreso.de_bytes(progreso.a_bytes())
+    assert (copia.vistas, copia.falladas, copia.dominadas) == (progreso.vistas, progreso.falladas, progreso.dominadas)
+
+def test_formato_desconocido():
+    with pytest.raises(ValueError):
+        Progreso.de_bytes(b"XXXX" + bytes(12))
+
+def test_fallada_deja_de_estar_pendiente_al_acertarla():
+    progreso = Progreso()
+    progreso.registrar([(5, False), (6, True)])
+    assert bits_a_ids(progreso.pendientes) == [5]
+    progreso.registrar([(5, True), (6, False)])
+    assert bits_a_ids(progreso.pendientes) == [6]
+    assert bits_a_ids(progreso.falladas) == [5, 6]
+
+def test_normalizar_usuario():
+    assert normalizar_usuario("  José Pérez ") == "jose_perez"
+    assert normalizar_usuario("¿?") is None
+
+def _registrar_varios(directorio, desde, cantidad):
+    for i in range(desde, desde + cantidad):
+        registrar_progreso("anac", "ana", [(i, True)], directorio)
+
+def test_procesos_concurrentes_no_pierden_intentos(tmp_path):
+    procesos, por_proceso = 6, 15
+    with ProcessPoolExecutor(procesos) as pool:
+        trabajos = [pool.submit(_registrar_varios, str(tmp_path), p * por_proceso, por_proceso)
+                    for p in range(procesos)]
+        for trabajo in trabajos:
+            trabajo.result()
+
+    progreso = cargar_progreso("anac", "ana", str(tmp_path))
+    assert bits_a_ids(progreso.vistas) == list(range(procesos * por_proceso))
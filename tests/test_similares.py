@@ -0,0 +1,66 @@
+# test_similares.py - Vecinos TF-IDF del índice invertido contra la similitud coseno densa
+
+import random
+
+import numpy as np
+
+import similares
+from similares import calcular_vecinos, matriz_tfidf, generar_tabla, cargar_tabla
+
+PALABRAS = ["motor", "helice", "aceite", "presion", "altimetro", "viento", "nube", "frente",
+            "pista", "torre", "radio", "combustible", "mezcla", "carburador", "flaps", "sustentacion"]
+
+def _preguntas(n=80, semilla=0):
+    rng = random.Random(semilla)
+    preguntas = []
+    for i in range(n):
+        texto = " ".join(rng.choices(PALABRAS, k=rng.randint(1, 8)))
+        opciones = [" ".join(rng.choices(PALABRAS, k=2)) for _ in range(3)]
+        preguntas.append({'id': 100 + i, 'pregunta': texto, 'opciones': opciones})
+    preguntas.append({'id': 999, 'pregunta': "¿?", 'opciones': ["si", "no"]})  # sin términos
+    return preguntas
+
+def _coseno_denso(preguntas):
+    indptr, indices, valores, n_terminos = matriz_tfidf(preguntas)
+    denso = np.zeros((len(preguntas), n_terminos))
+    for fila in range(len(preguntas)):
+        denso[fila, indices[indptr[fila]:indptr[fila + 1]]] = valores[indptr[fila]:indptr[fila + 1]]
+    similitud = denso @ denso.T
+    np.fill_diagonal(similitud, -1)
+    return similitud
+
+def test_vecinos_coinciden_con_coseno_denso():
+    preguntas = _preguntas()
+    vecinos, valores = calcular_vecinos(preguntas, k=5)
+    similitud = _coseno_denso(preguntas)
+    fila_de = {p['id']: i for i, p in enumerate(preguntas)}
+    for fila in range(len(preguntas)):
+        esperadas = np.sort(np.maximum(similitud[fila], 0))[::-1][:5]
+        assert np.allclose(valores[fila], esperadas, atol=1e-5)
+        for id_vecino, valor in zip(vecinos[fila], valores[fila]):
+            if id_vecino >= 0:
+                assert np.isclose(similitud[fila, fila_de[id_vecino]], valor, atol=1e-5)
+            else:
+                assert valor == 0
+
+def test_pregunta_sin_terminos_no_tiene_vecinos():
+    vecinos, _ = calcular_vecinos(_preguntas(), k=5)
+    assert (vecinos[-1] == -1).all()
+
+def test_lotes_chicos_dan_lo_mismo(monkeypatch):
+    preguntas = _preguntas(semilla=3)
+    vecinos, valores = calcular_vecinos(preguntas, k=4)
+    monkeypatch.setattr(similares, "ELEMENTOS_POR_LOTE", 50)
+    vecinos_lotes, valores_lotes = calcular_vecinos(preguntas, k=4)
+    assert np.allclose(valores, valores_lotes, atol=1e-6)
+    assert (vecinos == vecinos_lotes).mean() > 0.95  # Solo pueden diferir los empates
+
+def test_tabla_se_invalida_si_cambia_un_texto(tmp_path):
+    preguntas = _preguntas(n=20)
+    archivo = str(tmp_path / "banco_similares.npz")
+    generar_tabla(preguntas, archivo, k=3)
+    tabla = cargar_tabla(archivo, preguntas)
+    assert tabla is not None and len(tabla) == len(preguntas)
+    assert cargar_tabla(archivo, preguntas[:10]) is not None
+    preguntas[0] = dict(preguntas[0], pregunta=preguntas[0]['pregunta'] + " cambiada")
+    assert cargar_tabla(archivo, preguntas) is None
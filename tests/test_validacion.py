@@ -0,0 +1,98 @@
+# test_validacion.py - Validación del banco y su cache por huella
+
+import json
+import os
+
+import validacion
+from utils import cargar_preguntas
+from validacion import (validar_pregunta, validar_banco, validar_con_cache, huella_banco,
+                        MAX_ENTRADAS_CACHE, POSICION_BANCO)
+
+CATEGORIAS = {'general': "General", 'motor': "Motor"}
+
+def _pregunta(id_pregunta, **cambios):
+    pregunta = {'id': id_pregunta, 'pregunta': f"¿Pregunta {id_pregunta}?",
+                'opciones': ["uno", "dos", "tres"], 'correcta': 1, 'categoria': 'motor'}
+    pregunta.update(cambios)
+    return pregunta
+
+def test_pregunta_valida():
+    assert validar_pregunta(_pregunta(0), CATEGORIAS) == []
+
+def test_problemas_de_una_pregunta():
+    assert validar_pregunta(_pregunta(True), CATEGORIAS)[0].startswith("falta el 'id'")
+    assert validar_pregunta(_pregunta(0, opciones=["a", "A "]), CATEGORIAS) == ["hay opciones duplicadas"]
+    assert validar_pregunta(_pregunta(0, correcta=3), CATEGORIAS) == ["'correcta' (3) fuera de rango para 3 opciones"]
+    assert validar_pregunta(_pregunta(0, categoria='clima'), CATEGORIAS) == ["categoría desconocida 'clima'"]
+    assert validar_pregunta(_pregunta(0, imagen="no/existe.png"), CATEGORIAS) == ["no existe la imagen no/existe.png"]
+
+def test_entradas_que_no_son_objetos():
+    preguntas = [_pregunta(0), "basura", 7, None, ["a"], _pregunta(1)]
+    errores = validar_banco(preguntas, CATEGORIAS)
+    assert errores == {i: ["la pregunta debe ser un objeto"] for i in (1, 2, 3, 4)}
+
+def test_banco_que_no_es_lista():
+    assert validar_banco({'preguntas': [_pregunta(0)]}, CATEGORIAS) == {POSICION_BANCO: ["el banco debe ser una lista"]}
+
+def test_id_repetido_invalida_todas_sus_apariciones():
+    errores = validar_banco([_pregunta(0), _pregunta(1), _pregunta(0)], CATEGORIAS)
+    assert sorted(errores) == [0, 2]
+    assert errores[0] == ["id 0 repetido (posiciones [0, 2])"]
+
+def test_cache_reutiliza_el_resultado(tmp_path, monkeypatch):
+    directorio = str(tmp_path / "cache")
+    preguntas = [_pregunta(0), _pregunta(1, correcta=9)]
+    huella = huella_banco(json.dumps(preguntas).encode('utf-8'), CATEGORIAS)
+    assert validar_con_cache(preguntas, huella, directorio, CATEGORIAS) == {1: ["'correcta' (9) fuera de rango para 3 opciones"]}
+    assert os.listdir(directorio) == [f"{huella}.json"]
+
+    llamadas = []
+    monkeypatch.setattr(validacion, "validar_banco", lambda *a, **k: llamadas.append(a) or {})
+    assert 1 in validar_con_cache(preguntas, huella, directorio, CATEGORIAS)
+    assert llamadas == []
+
+def test_huella_depende_de_categorias_y_directorio():
+    datos = b'[]'
+    huellas = {huella_banco(datos, CATEGORIAS), huella_banco(datos, {'general': "General"}),
+               huella_banco(datos, CATEGORIAS, "imagenes"), huella_banco(b'[ ]', CATEGORIAS)}
+    assert len(huellas) == 4
+
+def test_imagen_borrada_se_detecta_con_cache(tmp_path):
+    directorio = str(tmp_path / "cache")
+    figura = tmp_path / "figura.png"
+    figura.write_bytes(b"png")
+    preguntas = [_pregunta(0, imagen=str(figura))]
+    assert validar_con_cache(preguntas, "h", directorio, CATEGORIAS) == {}
+    figura.unlink()
+    assert validar_con_cache(preguntas, "h", directorio, CATEGORIAS) == {0: [f"no existe la imagen {figura}"]}
+
+def test_cache_conserva_las_mas_recientes(tmp_path):
+    directorio = str(tmp_path / "cache")
+    total = MAX_ENTRADAS_CACHE + 3
+    for k in range(total):
+        validar_con_cache([_pregunta(0)], f"h{k:02d}", directorio, CATEGORIAS)
+        os.utime(os.path.join(directorio, f"h{k:02d}.json"), (k, k))
+    # Volver a usar una vieja la salva de la poda
+    validar_con_cache([_pregunta(0)], "h00", directorio, CATEGORIAS)
+    validar_con_cache([_pregunta(0)], "nueva", directorio, CATEGORIAS)
+    conservadas = sorted(os.listdir(directorio))
+    assert len(conservadas) == MAX_ENTRADAS_CACHE
+    assert conservadas[0] == "h00.json" and "nueva.json" in conservadas
+    assert "h01.json" not in conservadas and f"h{total - 1}.json" in conservadas
+
+def test_cargar_preguntas_omite_entradas_invalidas(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)  # La cache queda en tmp_path/.cache
+    archivo = tmp_path / "banco.json"
+    archivo.write_text(json.dumps([_pregunta(0), "basura", _pregunta(1, imagen="fig.png")]), encoding='utf-8')
+    (tmp_path / "img").mkdir()
+    (tmp_path / "img" / "fig.png").write_bytes(b"png")
+    preguntas = cargar_preguntas(str(archivo), CATEGORIAS, "img")
+    assert [p['id'] for p in preguntas] == [0, 1]
+    assert preguntas[1]['imagen'] == os.path.join("img", "fig.png")
+    assert "1 pregunta(s)" in capsys.readouterr().out
+
+def test_cargar_preguntas_banco_que_no_es_lista(tmp_path, capsys):
+    archivo = tmp_path / "banco.json"
+    archivo.write_text(json.dumps({'preguntas': []}), encoding='utf-8')
+    assert cargar_preguntas(str(archivo), CATEGORIAS) == []
+    assert "el banco debe ser una lista" in capsys.readouterr().out
@@ -1,22 +1,78 @@
 # utils.py - Funciones auxiliares
 
 import json
+import os
 import random
+import sys
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple
-import streamlit as st
 
-def cargar_preguntas(archivo: str = "datos_quiz.json") -> List[Dict]:
-    """Carga las preguntas desde el archivo JSON"""
+from validacion import validar_con_cache, huella_banco
+
+def avisar(nivel: str, mensaje: str):
+    """
+    Muestra un aviso ('error' o 'warning') en la app. Fuera de Streamlit (scripts, API)
+    lo imprime: así importar utils no arrastra streamlit a esos procesos.
+    """
+    st = sys.modules.get("streamlit")
+    if st is not None:
+        getattr(st, nivel)(mensaje)
+    else:
+        print(mensaje)
+
+def cargar_preguntas(
+    archivo: str = "datos_quiz.json",
+    categorias: Dict = None,
+    directorio_imagenes: str = ""
+) -> List[Dict]:
+    """
+    Carga las preguntas desde el archivo JSON y descarta las que no pasan la validación.
+    La validación se cachea por hash del archivo. Las rutas de imagen se resuelven
+    relativas a directorio_imagenes si se indica.
+    """
     try:
-        with open(archivo, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(archivo, 'rb') as f:
+            datos = f.read()
+        preguntas = json.loads(datos.decode('utf-8'))
     except FileNotFoundError:
-        st.error(f"❌ No se encontró el archivo {archivo}")
+        avisar('error', f"❌ No se encontró el archivo {archivo}")
+        return []
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        avisar('error', f"❌ Error al leer el archivo {archivo}")
         return []
-    except json.JSONDecodeError:
-        st.error(f"❌ Error al leer el archivo {archivo}")
+    if not isinstance(preguntas, list):
+        avisar('error', f"❌ Error en el archivo {archivo}: el banco debe ser una lista")
         return []
+    
+    if directorio_imagenes:
+        for pregunta in preguntas:
+            if isinstance(pregunta, dict) and pregunta.get('imagen'):
+                pregunta['imagen'] = os.path.join(directorio_imagenes, pregunta['imagen'])
+    
+    huella = huella_banco(datos, categorias, directorio_imagenes)
+    errores = validar_con_cache(preguntas, huella, categorias=categorias)
+    if errores:
+        avisar('warning', f"⚠️ Se omitieron {len(errores)} pregunta(s) inválidas de {archivo} "
+                          f"(ejecuta validacion.py para ver el detalle)")
+        preguntas = [p for i, p in enumerate(preguntas) if i not in errores]
+    return preguntas
+
+def asignar_ids(preguntas: List[Dict]) -> int:
+    """
+    Da un 'id' a las preguntas que no lo tienen, a continuación del mayor existente.
+    El id queda guardado en el banco y no cambia aunque se agreguen o quiten preguntas
+    (progreso, intentos y análisis se guardan por id). Devuelve cuántos asignó.
+    """
+    existentes = [p['id'] for p in preguntas if isinstance(p.get('id'), int)]
+    siguiente = max(existentes, default=-1) + 1
+    asignados = 0
+    for i, pregunta in enumerate(preguntas):
+        if 'id' not in pregunta:
+            # El id va primero para que se vea al editar el JSON a mano
+            preguntas[i] = {'id': siguiente, **pregunta}
+            siguiente += 1
+            asignados += 1
+    return asignados
 
 def seleccionar_preguntas(
     todas_preguntas: List[Dict], 
@@ -51,8 +107,6 @@ def calcular_estadisticas(respuestas: List[Dict]) -> Dict:
         return {}
     
     correctas = sum(1 for r in respuestas if r['correcta'])
-    incorrectas = total - correctas
-    porcentaje = (correctas / total) * 100
     
     # Estadísticas por categoría
     stats_categoria = {}
@@ -64,6 +118,15 @@ def calcular_estadisticas(respuestas: List[Dict]) -> Dict:
         if r['correcta']:
             stats_categoria[cat]['correctas'] += 1
     
+    return armar_estadisticas(total, correctas, stats_categoria)
+
+def armar_estadisticas(total: int, correctas: int, stats_categoria: Dict) -> Dict:
+    """
+    Arma el diccionario de estadísticas a partir de los conteos totales y por categoría
+    """
+    incorrectas = total - correctas
+    porcentaje = (correctas / total) * 100
+    
     # Calcular porcentaje por categoría
     for cat in stats_categoria:
         total_cat = stats_categoria[cat]['total']
@@ -79,6 +142,23 @@ def calcular_estadisticas(respuestas: List[Dict]) -> Dict:
         'por_categoria': stats_categoria
     }
 
+def registrar_intento(respuestas: List[Dict], archivo: str = "intentos.jsonl", origen: str = "app"):
+    """
+    Agrega un intento terminado al registro de intentos (una línea JSON por intento).
+    Cada respuesta se guarda como [id de pregunta, índice de opción elegida] (-1 si quedó en blanco).
+    """
+    items = [[r['id'], r['indice_usuario']] for r in respuestas if 'id' in r]
+    if not items:
+        return
+    
+    linea = json.dumps({
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'origen': origen,
+        'respuestas': items
+    }, ensure_ascii=False)
+    with open(archivo, 'a', encoding='utf-8') as f:
+        f.write(linea + "\n")
+
 def formatear_tiempo(segundos: int) -> str:
     """Formatea segundos en formato HH:MM:SS"""
     horas = segundos // 3600
@@ -169,8 +249,11 @@ def migrar_preguntas_con_categorias(archivo_entrada: str, archivo_salida: str):
     """
     Migra el archivo de preguntas antiguo agregando categorías automáticamente
     """
-    preguntas = cargar_preguntas(archivo_entrada)
+    # Se lee el archivo sin validar: la migración debe conservar todas las preguntas
+    with open(archivo_entrada, 'r', encoding='utf-8') as f:
+        preguntas = json.load(f)
     
+    asignar_ids(preguntas)
     for pregunta in preguntas:
         if 'categoria' not in pregunta:
             pregunta['categoria'] = detectar_categoria_automatica(pregunta['pregunta'])
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Validación del banco de preguntas
+Revisa índices, opciones, imágenes y categorías de cada pregunta. El resultado se
+cachea por hash del archivo para que los reinicios no repitan la validación.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from typing import List, Dict
+
+from config import CATEGORIAS
+
+DIRECTORIO_CACHE = os.path.join(".cache", "validacion")
+# Resultados guardados como máximo (se conservan los usados más recientemente)
+MAX_ENTRADAS_CACHE = 32
+# Posición con la que se informan los problemas del archivo entero (no de una pregunta)
+POSICION_BANCO = -1
+
+def validar_imagen(pregunta: Dict) -> List[str]:
+    """Problemas con la figura de la pregunta; se revisa siempre, no se cachea"""
+    if not isinstance(pregunta, dict):
+        return []
+    imagen = pregunta.get('imagen')
+    if imagen and not os.path.isfile(imagen):
+        return [f"no existe la imagen {imagen}"]
+    return []
+
+def validar_pregunta(pregunta: Dict, categorias: Dict = None, con_imagen: bool = True) -> List[str]:
+    """Devuelve la lista de problemas de una pregunta (vacía si es válida)"""
+    if not isinstance(pregunta, dict):
+        return ["la pregunta debe ser un objeto"]
+    categorias = CATEGORIAS if categorias is None else categorias
+    errores = []
+
+    id_pregunta = pregunta.get('id')
+    if not isinstance(id_pregunta, int) or isinstance(id_pregunta, bool) or id_pregunta < 0:
+        errores.append("falta el 'id' (entero no negativo); ejecuta migrar_preguntas.py para asignarlo")
+
+    texto = pregunta.get('pregunta')
+    if not isinstance(texto, str) or not texto.strip():
+        errores.append("falta el texto de la pregunta")
+
+    opciones = pregunta.get('opciones')
+    if not isinstance(opciones, list) or len(opciones) < 2:
+        errores.append("debe tener al menos 2 opciones")
+        opciones = []
+    elif not all(isinstance(o, str) and o.strip() for o in opciones):
+        errores.append("hay opciones vacías o que no son texto")
+    else:
+        normalizadas = [o.strip().lower() for o in opciones]
+        if len(set(normalizadas)) != len(normalizadas):
+            errores.append("hay opciones duplicadas")
+
+    correcta = pregunta.get('correcta')
+    if not isinstance(correcta, int) or isinstance(correcta, bool):
+        errores.append("'correcta' debe ser un índice entero")
+    elif opciones and not 0 <= correcta < len(opciones):
+        errores.append(f"'correcta' ({correcta}) fuera de rango para {len(opciones)} opciones")
+
+    if con_imagen:
+        errores.extend(validar_imagen(pregunta))
+
+    categoria = pregunta.get('categoria', 'general')
+    if categoria not in categorias:
+        errores.append(f"categoría desconocida '{categoria}'")
+
+    return errores
+
+def validar_banco(preguntas: List[Dict], categorias: Dict = None, con_imagenes: bool = True) -> Dict[int, List[str]]:
+    """
+    Valida todas las preguntas y devuelve los problemas agrupados por posición en el
+    archivo (no por id, que puede faltar o estar repetido). Si el archivo no contiene
+    una lista, el problema se informa en POSICION_BANCO.
+    """
+    if not isinstance(preguntas, list):
+        return {POSICION_BANCO: ["el banco debe ser una lista"]}
+    errores = {}
+    posiciones_de_id = {}
+    for i, pregunta in enumerate(preguntas):
+        problemas = validar_pregunta(pregunta, categorias, con_imagenes)
+        if problemas:
+            errores[i] = problemas
+        if isinstance(pregunta, dict) and isinstance(pregunta.get('id'), int):
+            posiciones_de_id.setdefault(pregunta['id'], []).append(i)
+
+    # Un id repetido invalida todas sus apariciones: no se sabe a cuál corresponden los datos guardados
+    for id_pregunta, posiciones in posiciones_de_id.items():
+        if len(posiciones) > 1:
+            for i in posiciones:
+                errores.setdefault(i, []).append(f"id {id_pregunta} repetido (posiciones {posiciones})")
+    return errores
+
+def huella_banco(datos: bytes, categorias: Dict = None, directorio_imagenes: str = "") -> str:
+    """Hash del contenido del banco, de las categorías y del directorio contra los que se valida"""
+    categorias = CATEGORIAS if categorias is None else categorias
+    h = hashlib.sha256(datos)
+    h.update(json.dumps([sorted(categorias), directorio_imagenes]).encode('utf-8'))
+    return h.hexdigest()
+
+def _podar_cache(directorio: str, conservar: int = MAX_ENTRADAS_CACHE):
+    """Borra los resultados menos usados (cada versión del banco deja uno nuevo)"""
+    try:
+        entradas = [e for e in os.scandir(directorio) if e.name.endswith(".json")]
+    except OSError:
+        return
+    entradas.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for entrada in entradas[conservar:]:
+        try:
+            os.remove(entrada.path)
+        except OSError:
+            pass
+
+def validar_con_cache(preguntas: List[Dict], huella: str, directorio: str = DIRECTORIO_CACHE,
+                      categorias: Dict = None) -> Dict[int, List[str]]:
+    """
+    Igual que validar_banco, pero reutiliza el resultado guardado para la misma huella.
+    Las figuras no forman parte de la huella: su existencia se revisa en cada carga,
+    así una figura borrada se detecta aunque el JSON no haya cambiado.
+    """
+    ruta = os.path.join(directorio, f"{huella}.json")
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            errores = {int(k): v for k, v in json.load(f).items()}
+        try:
+            os.utime(ruta)  # Marca el resultado como usado recientemente
+        except OSError:
+            pass
+    except (FileNotFoundError, json.JSONDecodeError):
+        errores = validar_banco(preguntas, categorias, con_imagenes=False)
+        try:
+            os.makedirs(directorio, exist_ok=True)
+            temporal = f"{ruta}.{os.getpid()}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(errores, f, ensure_ascii=False)
+            os.replace(temporal, ruta)
+            _podar_cache(directorio)
+        except OSError:
+            # Sin permisos de escritura: se valida igual, solo que sin cache
+            pass
+
+    for i, pregunta in enumerate(preguntas):
+        problemas = validar_imagen(pregunta)
+        if problemas:
+            errores.setdefault(i, []).extend(problemas)
+    return errores
+
+if __name__ == "__main__":
+    from bancos import BANCOS, banco_de_entorno
+
+    parser = argparse.ArgumentParser(description="Valida las preguntas de un banco")
+    parser.add_argument("--banco", default=banco_de_entorno(), choices=list(BANCOS),
+                        help="Banco de preguntas (por defecto, el del despliegue)")
+    args = parser.parse_args()
+
+    # Mismo archivo, categorías y figuras con los que la app carga el banco
+    configuracion = BANCOS[args.banco]
+    archivo = configuracion['archivo']
+    categorias = configuracion.get('categorias', CATEGORIAS)
+    directorio_imagenes = configuracion.get('imagenes', "")
+
+    print(f"🔎 Validando {archivo}...")
+    try:
+        with open(archivo, 'r', encoding='utf-8') as f:
+            preguntas = json.load(f)
+    except FileNotFoundError:
+        print(f"❌ Error: No se encontró el archivo {archivo}")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"❌ Error: El archivo {archivo} no es un JSON válido ({e})")
+        sys.exit(1)
+
+    if not isinstance(preguntas, list):
+        print(f"❌ Error: el banco debe ser una lista ({archivo})")
+        sys.exit(1)
+
+    if directorio_imagenes:
+        for pregunta in preguntas:
+            if isinstance(pregunta, dict) and pregunta.get('imagen'):
+                pregunta['imagen'] = os.path.join(directorio_imagenes, pregunta['imagen'])
+
+    errores = validar_banco(preguntas, categorias)
+    if not errores:
+        print(f"✅ Las {len(preguntas)} preguntas son válidas")
+        sys.exit(0)
+
+    for posicion, problemas in errores.items():
+        pregunta = preguntas[posicion] if isinstance(preguntas[posicion], dict) else {}
+        texto = str(pregunta.get('pregunta', ''))[:60]
+        print(f"\n  [{posicion:4d}] id={pregunta.get('id')} {texto}")
+        for problema in problemas:
+            print(f"         ❌ {problema}")
+    print(f"\n❌ {len(errores)} de {len(preguntas)} preguntas tienen problemas")
+    sys.exit(1)